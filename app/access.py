@@ -0,0 +1,227 @@
+"""Resource → wallet → classroom ownership checks shared by the routers.
+
+Each resolver loads the resource, its wallet and the owning teacher id in one
+joined query and memoizes the result on the session, so repeated checks within
+a request do not go back to the database. Teachers additionally get a cached
+index of the classroom and wallet ids they own, turning most checks into set
+lookups and letting list queries filter with ``IN (...)`` instead of joins.
+"""
+
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.deps import Principal
+from app.models import Classroom, LedgerEntry, StudentWallet, WalletBucket
+
+MEMO_KEY = "access_memo"
+
+ownership_cache = TTLCache(
+    "teacher_ownership",
+    maxsize=settings.ownership_cache_max_entries,
+    ttl=settings.ownership_cache_ttl_seconds,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class WalletScope:
+    wallet: StudentWallet
+    teacher_id: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class TeacherIndex:
+    classroom_ids: frozenset[int]
+    wallet_ids: frozenset[int]
+
+
+def _memo(db: Session | AsyncSession) -> dict:
+    return db.info.setdefault(MEMO_KEY, {})
+
+
+def check_classroom_owner(teacher_id: int | None, current_user: Principal) -> None:
+    if teacher_id is None:
+        raise HTTPException(status_code=404, detail="Classroom not found")
+    if current_user.role == "teacher" and teacher_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+
+def check_wallet_access(scope: WalletScope, current_user: Principal) -> StudentWallet:
+    if current_user.role == "student" and scope.wallet.student_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if current_user.role == "teacher":
+        check_classroom_owner(scope.teacher_id, current_user)
+    return scope.wallet
+
+
+def _teacher_index_statement(teacher_id: int) -> Select:
+    return (
+        select(Classroom.id, StudentWallet.id)
+        .outerjoin(StudentWallet, StudentWallet.classroom_id == Classroom.id)
+        .where(Classroom.teacher_id == teacher_id)
+    )
+
+
+def _build_teacher_index(rows) -> TeacherIndex:
+    return TeacherIndex(
+        classroom_ids=frozenset(classroom_id for classroom_id, _ in rows),
+        wallet_ids=frozenset(wallet_id for _, wallet_id in rows if wallet_id is not None),
+    )
+
+
+def get_teacher_index(db: Session, teacher_id: int) -> TeacherIndex:
+    index = ownership_cache.get(teacher_id)
+    if index is None:
+        index = _build_teacher_index(db.execute(_teacher_index_statement(teacher_id)).all())
+        ownership_cache.set(teacher_id, index)
+    return index
+
+
+async def get_teacher_index_async(db: AsyncSession, teacher_id: int) -> TeacherIndex:
+    index = ownership_cache.get(teacher_id)
+    if index is None:
+        rows = (await db.execute(_teacher_index_statement(teacher_id))).all()
+        index = _build_teacher_index(rows)
+        ownership_cache.set(teacher_id, index)
+    return index
+
+
+def invalidate_teacher_index(*teacher_ids: int | None) -> None:
+    for teacher_id in teacher_ids:
+        if teacher_id is not None:
+            ownership_cache.pop(teacher_id)
+
+
+def classroom_owners(db: Session, *classroom_ids: int | None) -> list[int]:
+    ids = [classroom_id for classroom_id in classroom_ids if classroom_id is not None]
+    if not ids:
+        return []
+    return list(db.scalars(select(Classroom.teacher_id).where(Classroom.id.in_(ids))))
+
+
+def _classroom_statement(classroom_id: int) -> Select:
+    return select(Classroom.teacher_id).where(Classroom.id == classroom_id)
+
+
+def _wallet_statement(wallet_id: int) -> Select:
+    return (
+        select(StudentWallet, Classroom.teacher_id)
+        .outerjoin(Classroom, StudentWallet.classroom_id == Classroom.id)
+        .where(StudentWallet.id == wallet_id)
+    )
+
+
+def _resource_statement(model, resource_id: int) -> Select:
+    return (
+        select(model, StudentWallet, Classroom.teacher_id)
+        .outerjoin(StudentWallet, model.wallet_id == StudentWallet.id)
+        .outerjoin(Classroom, StudentWallet.classroom_id == Classroom.id)
+        .where(model.id == resource_id)
+    )
+
+
+def _remember_wallet(
+    db: Session | AsyncSession, wallet: StudentWallet | None, teacher_id: int | None
+) -> WalletScope:
+    if not wallet:
+        raise HTTPException(status_code=404, detail="Wallet not found")
+    scope = WalletScope(wallet, teacher_id)
+    memo = _memo(db)
+    memo[("wallet", wallet.id)] = scope
+    memo[("classroom", wallet.classroom_id)] = teacher_id
+    return scope
+
+
+def ensure_classroom_access(db: Session, classroom_id: int, current_user: Principal) -> None:
+    if current_user.role == "teacher":
+        if classroom_id in get_teacher_index(db, current_user.id).classroom_ids:
+            return
+    memo = _memo(db)
+    key = ("classroom", classroom_id)
+    if key not in memo:
+        memo[key] = db.scalar(_classroom_statement(classroom_id))
+    check_classroom_owner(memo[key], current_user)
+
+
+def get_wallet_scope(db: Session, wallet_id: int) -> WalletScope:
+    scope = _memo(db).get(("wallet", wallet_id))
+    if scope is None:
+        row = db.execute(_wallet_statement(wallet_id)).first()
+        scope = _remember_wallet(db, *(row or (None, None)))
+    return scope
+
+
+def ensure_wallet_access(db: Session, wallet_id: int, current_user: Principal) -> StudentWallet:
+    return check_wallet_access(get_wallet_scope(db, wallet_id), current_user)
+
+
+def authorize_wallet(db: Session, wallet_id: int, current_user: Principal) -> None:
+    """Like ``ensure_wallet_access`` for callers that do not need the wallet row."""
+    if current_user.role == "teacher":
+        if wallet_id in get_teacher_index(db, current_user.id).wallet_ids:
+            return
+    ensure_wallet_access(db, wallet_id, current_user)
+
+
+def _get_resource_with_access(
+    db: Session, model, resource_id: int, current_user: Principal, label: str
+):
+    key = (model.__tablename__, resource_id)
+    memo = _memo(db)
+    if key not in memo:
+        row = db.execute(_resource_statement(model, resource_id)).first()
+        if not row:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        resource, wallet, teacher_id = row
+        memo[key] = resource
+        _remember_wallet(db, wallet, teacher_id)
+    resource = memo[key]
+    check_wallet_access(get_wallet_scope(db, resource.wallet_id), current_user)
+    return resource
+
+
+def get_bucket_with_access(db: Session, bucket_id: int, current_user: Principal) -> WalletBucket:
+    return _get_resource_with_access(db, WalletBucket, bucket_id, current_user, "Bucket")
+
+
+def get_entry_with_access(db: Session, entry_id: int, current_user: Principal) -> LedgerEntry:
+    return _get_resource_with_access(db, LedgerEntry, entry_id, current_user, "Ledger entry")
+
+
+async def ensure_classroom_access_async(
+    db: AsyncSession, classroom_id: int, current_user: Principal
+) -> None:
+    if current_user.role == "teacher":
+        index = await get_teacher_index_async(db, current_user.id)
+        if classroom_id in index.classroom_ids:
+            return
+    memo = _memo(db)
+    key = ("classroom", classroom_id)
+    if key not in memo:
+        memo[key] = await db.scalar(_classroom_statement(classroom_id))
+    check_classroom_owner(memo[key], current_user)
+
+
+async def ensure_wallet_access_async(
+    db: AsyncSession, wallet_id: int, current_user: Principal
+) -> StudentWallet:
+    scope = _memo(db).get(("wallet", wallet_id))
+    if scope is None:
+        row = (await db.execute(_wallet_statement(wallet_id))).first()
+        scope = _remember_wallet(db, *(row or (None, None)))
+    return check_wallet_access(scope, current_user)
+
+
+async def authorize_wallet_async(
+    db: AsyncSession, wallet_id: int, current_user: Principal
+) -> None:
+    if current_user.role == "teacher":
+        index = await get_teacher_index_async(db, current_user.id)
+        if wallet_id in index.wallet_ids:
+            return
+    await ensure_wallet_access_async(db, wallet_id, current_user)
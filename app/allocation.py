@@ -0,0 +1,132 @@
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Numeric, Select, bindparam, case, func, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from app.models import StudentWallet, WalletBucket
+
+CENT = Decimal("0.01")
+HUNDRED = Decimal(100)
+
+
+def split_amount(amount: Decimal, targets: list[tuple[int, Decimal]]) -> dict[int, Decimal]:
+    """Split ``amount`` across ``(bucket_id, percent_target)`` pairs.
+
+    Each bucket gets its percentage of the amount, rounded to the cent. When
+    the targets add up to 100 or more the amount is split in proportion to them
+    and the bucket with the largest target (lowest id on ties) takes the
+    rounding remainder, so the shares always sum to ``amount``. Below 100 the
+    rest stays unallocated in the wallet.
+    """
+    targets = sorted(
+        ((bucket_id, percent) for bucket_id, percent in targets if percent > 0),
+        key=lambda target: (-target[1], target[0]),
+    )
+    total = sum((percent for _, percent in targets), Decimal(0))
+    denominator = max(total, HUNDRED)
+    shares = {
+        bucket_id: (amount * percent / denominator).quantize(CENT, rounding=ROUND_HALF_UP)
+        for bucket_id, percent in targets
+    }
+    if targets and total >= HUNDRED:
+        first = targets[0][0]
+        shares[first] = amount - sum(
+            (share for bucket_id, share in shares.items() if bucket_id != first), Decimal(0)
+        )
+    return shares
+
+
+def allocate_deltas(db: Session, deltas: dict[int, Decimal]) -> None:
+    """Spread per-wallet balance deltas over each wallet's buckets.
+
+    One SELECT loads the targets and one executemany shifts the bucket
+    balances, in bucket id order; wallets without targeted buckets are skipped.
+    """
+    deltas = {wallet_id: delta for wallet_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    targets: dict[int, list[tuple[int, Decimal]]] = defaultdict(list)
+    for bucket_id, wallet_id, percent in db.execute(
+        select(WalletBucket.id, WalletBucket.wallet_id, WalletBucket.percent_target).where(
+            WalletBucket.wallet_id.in_(sorted(deltas)), WalletBucket.percent_target > 0
+        )
+    ):
+        targets[wallet_id].append((bucket_id, Decimal(str(percent))))
+    shares: dict[int, Decimal] = {}
+    for wallet_id, wallet_targets in targets.items():
+        shares.update(split_amount(deltas[wallet_id], wallet_targets))
+    params = [
+        {"target_bucket_id": bucket_id, "delta": share}
+        for bucket_id, share in sorted(shares.items())
+        if share
+    ]
+    if not params:
+        return
+    buckets = WalletBucket.__table__
+    db.connection().execute(
+        update(buckets)
+        .where(buckets.c.id == bindparam("target_bucket_id"))
+        .values(balance=buckets.c.balance + bindparam("delta", type_=buckets.c.balance.type)),
+        params,
+    )
+
+
+def _reallocation_shares(wallets: Select):
+    """Per-bucket balances for ``wallets`` computed in SQL with ``split_amount``'s rules."""
+    percent = case((WalletBucket.percent_target > 0, WalletBucket.percent_target), else_=0)
+    total = func.sum(percent).over(partition_by=WalletBucket.wallet_id)
+    # Unbounded numeric, so a wallet whose targets add up past 999.99 cannot overflow.
+    denominator = type_coerce(case((total > 100, total), else_=100), Numeric())
+    ranked = (
+        select(
+            WalletBucket.id,
+            WalletBucket.wallet_id,
+            StudentWallet.balance.label("wallet_balance"),
+            total.label("total"),
+            func.row_number()
+            .over(
+                partition_by=WalletBucket.wallet_id,
+                order_by=(percent.desc(), WalletBucket.id),
+            )
+            .label("rank"),
+            func.round(StudentWallet.balance * percent / denominator, 2).label("share"),
+        )
+        .join(StudentWallet, StudentWallet.id == WalletBucket.wallet_id)
+        .where(WalletBucket.wallet_id.in_(wallets))
+        .subquery()
+    )
+    others = func.sum(ranked.c.share).over(partition_by=ranked.c.wallet_id) - ranked.c.share
+    return select(
+        ranked.c.id,
+        case(
+            (
+                (ranked.c.rank == 1) & (ranked.c.total >= 100),
+                ranked.c.wallet_balance - others,
+            ),
+            else_=ranked.c.share,
+        ).label("balance"),
+    ).subquery()
+
+
+def reallocate_buckets(
+    db: Session, classroom_id: int | None = None, wallet_id: int | None = None
+) -> int:
+    """Re-split current wallet balances over their buckets with one UPDATE ... FROM.
+
+    Scoped to one classroom or one wallet, or every wallet when neither is given.
+    Buckets without a target are reset to zero. The caller commits.
+    """
+    wallets = select(StudentWallet.id)
+    if classroom_id is not None:
+        wallets = wallets.where(StudentWallet.classroom_id == classroom_id)
+    if wallet_id is not None:
+        wallets = wallets.where(StudentWallet.id == wallet_id)
+    shares = _reallocation_shares(wallets)
+    result = db.execute(
+        update(WalletBucket)
+        .where(WalletBucket.id == shares.c.id)
+        .values(balance=shares.c.balance)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,72 @@
+"""Hot/archive split for ledger entries.
+
+Entries of archived classrooms or closed terms move to ``ledger_entries_archive``
+so the live table and its indexes only cover the current term. Reads include
+the archive only when a caller passes ``include_archived``.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import delete, insert, literal, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.models import ArchivedLedgerEntry, LedgerEntry, StudentWallet
+from app.models.ledger import utcnow
+
+LEDGER_COLUMNS = [column.name for column in LedgerEntry.__table__.columns]
+
+
+def ledger_source(include_archived: bool = False):
+    """``LedgerEntry``, or an alias of it over ``ledger_entries UNION ALL archive``."""
+    if not include_archived:
+        return LedgerEntry
+    combined = union_all(
+        select(*(LedgerEntry.__table__.c[name] for name in LEDGER_COLUMNS)),
+        select(*(ArchivedLedgerEntry.__table__.c[name] for name in LEDGER_COLUMNS)),
+    ).subquery("ledger_entries_all")
+    return aliased(LedgerEntry, combined, adapt_on_names=True)
+
+
+def archive_ledger_entries(
+    db: Session,
+    classroom_id: int | None = None,
+    before: datetime | None = None,
+    batch_size: int = 5000,
+) -> int:
+    """Move matching entries to the archive in short ``batch_size`` transactions."""
+    if classroom_id is None and before is None:
+        raise ValueError("archive_ledger_entries needs classroom_id or before")
+    criteria = []
+    if classroom_id is not None:
+        criteria.append(
+            LedgerEntry.wallet_id.in_(
+                select(StudentWallet.id).where(StudentWallet.classroom_id == classroom_id)
+            )
+        )
+    if before is not None:
+        criteria.append(LedgerEntry.created_at < before)
+
+    moved = 0
+    while True:
+        ids = db.scalars(
+            select(LedgerEntry.id)
+            .where(*criteria)
+            .order_by(LedgerEntry.id)
+            .limit(batch_size)
+            .with_for_update()
+        ).all()
+        if not ids:
+            return moved
+        archived_at = utcnow()
+        db.execute(
+            insert(ArchivedLedgerEntry).from_select(
+                [*LEDGER_COLUMNS, "archived_at"],
+                select(
+                    *(LedgerEntry.__table__.c[name] for name in LEDGER_COLUMNS),
+                    literal(archived_at, ArchivedLedgerEntry.archived_at.type),
+                ).where(LedgerEntry.id.in_(ids)),
+            )
+        )
+        db.execute(delete(LedgerEntry).where(LedgerEntry.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from app.allocation import allocate_deltas
+from app.archive import ledger_source
+from app.core.config import settings
+from app.models import ArchivedLedgerEntry, LedgerEntry, StudentWallet, WalletBalanceSnapshot
+from app.models.ledger import utcnow
+
+
+def signed_amount_sql(entry=LedgerEntry):
+    return case((entry.entry_type == "withdrawal", -entry.amount), else_=entry.amount)
+
+
+def signed_amount(entry_type: str, amount) -> Decimal:
+    value = Decimal(str(amount))
+    return -value if entry_type == "withdrawal" else value
+
+
+def apply_balance_delta(db: Session, wallet_id: int, delta: Decimal) -> None:
+    """Shift the wallet balance in the database, never via a Python read-modify-write.
+
+    The delta is also spread over the wallet's buckets by their targets. Run it
+    as the last statement before commit so the row locks are held briefly.
+    """
+    if not delta:
+        return
+    db.execute(
+        update(StudentWallet)
+        .where(StudentWallet.id == wallet_id)
+        .values(balance=StudentWallet.balance + delta)
+        .execution_options(synchronize_session=False)
+    )
+    allocate_deltas(db, {wallet_id: delta})
+
+
+def apply_balance_deltas(db: Session, deltas: dict[int, Decimal]) -> None:
+    """Apply a different delta per wallet with one executemany, in wallet id order."""
+    wallets = StudentWallet.__table__
+    params = [
+        {"target_wallet_id": wallet_id, "delta": delta}
+        for wallet_id, delta in sorted(deltas.items())
+        if delta
+    ]
+    if not params:
+        return
+    db.connection().execute(
+        update(wallets)
+        .where(wallets.c.id == bindparam("target_wallet_id"))
+        .values(balance=wallets.c.balance + bindparam("delta", type_=wallets.c.balance.type)),
+        params,
+    )
+    allocate_deltas(db, deltas)
+
+
+def apply_balance_delta_many(db: Session, wallet_ids: list[int], delta: Decimal) -> None:
+    """Set-wise variant of ``apply_balance_delta`` for the same delta on many wallets."""
+    if not delta or not wallet_ids:
+        return
+    db.execute(
+        update(StudentWallet)
+        .where(StudentWallet.id.in_(wallet_ids))
+        .values(balance=StudentWallet.balance + delta)
+        .execution_options(synchronize_session=False)
+    )
+    allocate_deltas(db, dict.fromkeys(wallet_ids, delta))
+
+
+def _latest_snapshots(as_of: datetime):
+    latest = (
+        select(
+            WalletBalanceSnapshot.wallet_id,
+            func.max(WalletBalanceSnapshot.as_of).label("as_of"),
+        )
+        .where(WalletBalanceSnapshot.as_of <= as_of)
+        .group_by(WalletBalanceSnapshot.wallet_id)
+        .subquery()
+    )
+    return (
+        select(WalletBalanceSnapshot.wallet_id, WalletBalanceSnapshot.as_of, WalletBalanceSnapshot.balance)
+        .join(
+            latest,
+            and_(
+                WalletBalanceSnapshot.wallet_id == latest.c.wallet_id,
+                WalletBalanceSnapshot.as_of == latest.c.as_of,
+            ),
+        )
+        .subquery()
+    )
+
+
+def take_balance_snapshots(db: Session, as_of: datetime | None = None) -> int:
+    """Snapshot every wallet with ledger activity since its previous snapshot.
+
+    ``as_of`` defaults to ``balance_snapshot_settle_seconds`` ago so entries
+    still in flight are not skipped. One INSERT ... SELECT covers all wallets.
+    """
+    if as_of is None:
+        as_of = utcnow() - timedelta(seconds=settings.balance_snapshot_settle_seconds)
+    base = _latest_snapshots(as_of)
+    entry = ledger_source(include_archived=True)
+    tail = (
+        select(entry.wallet_id, func.sum(signed_amount_sql(entry)).label("delta"))
+        .outerjoin(base, base.c.wallet_id == entry.wallet_id)
+        .where(
+            entry.created_at <= as_of,
+            or_(base.c.as_of.is_(None), entry.created_at > base.c.as_of),
+        )
+        .group_by(entry.wallet_id)
+        .subquery()
+    )
+    rows = (
+        select(
+            tail.c.wallet_id,
+            literal(as_of, WalletBalanceSnapshot.as_of.type),
+            func.coalesce(base.c.balance, 0) + tail.c.delta,
+        )
+        .outerjoin(base, base.c.wallet_id == tail.c.wallet_id)
+        .where(or_(base.c.as_of.is_(None), base.c.as_of < as_of))
+    )
+    result = db.execute(
+        insert(WalletBalanceSnapshot).from_select(
+            ["wallet_id", "as_of", "balance"], rows
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def balance_as_of(db: Session, wallet_id: int, as_of: datetime) -> tuple[Decimal, datetime | None]:
+    """Ledger balance at ``as_of``: nearest snapshot plus the entries after it."""
+    snapshot = db.execute(
+        select(WalletBalanceSnapshot.as_of, WalletBalanceSnapshot.balance)
+        .where(WalletBalanceSnapshot.wallet_id == wallet_id, WalletBalanceSnapshot.as_of <= as_of)
+        .order_by(WalletBalanceSnapshot.as_of.desc())
+        .limit(1)
+    ).first()
+    start = Decimal(str(snapshot.balance)) if snapshot is not None else Decimal(0)
+    for entry in (LedgerEntry, ArchivedLedgerEntry):
+        query = select(func.coalesce(func.sum(signed_amount_sql(entry)), 0)).where(
+            entry.wallet_id == wallet_id, entry.created_at <= as_of
+        )
+        if snapshot is not None:
+            query = query.where(entry.created_at > snapshot.as_of)
+        start += Decimal(str(db.scalar(query)))
+    return start, snapshot.as_of if snapshot else None
+
+
+def invalidate_snapshots(db: Session, wallet_id: int, since: datetime) -> None:
+    """Drop snapshots that include an entry created at ``since`` that has since changed."""
+    db.execute(
+        delete(WalletBalanceSnapshot).where(
+            WalletBalanceSnapshot.wallet_id == wallet_id,
+            WalletBalanceSnapshot.as_of >= since,
+        )
+    )
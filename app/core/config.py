@@ -3,9 +3,48 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./endowal.db"
+    database_replica_url: str | None = None
+    replica_pin_seconds: float = 5
+    db_async_mode: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_pre_ping: bool = False
+    db_pool_recycle: int = -1
+    metrics_enabled: bool = True
+    sql_instrumentation: bool = True
+    sql_detect_n_plus_one: bool = False
+    sql_statement_budget: int = 10
+    sql_repeat_threshold: int = 3
+    sqlite_tuning: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size: int = 268435456
     secret_key: str = "change-me"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    principal_cache_ttl_seconds: float = 30
+    principal_cache_max_entries: int = 10000
+    token_cache_max_entries: int = 10000
+    ownership_cache_ttl_seconds: float = 60
+    ownership_cache_max_entries: int = 10000
+    ledger_summary_cache_ttl_seconds: float = 15
+    ledger_summary_cache_max_entries: int = 1024
+    dashboard_cache_ttl_seconds: float = 30
+    dashboard_cache_max_entries: int = 512
+    password_hash_pool: str = "thread"
+    password_hash_workers: int = 0
+    password_hash_max_queue: int = 64
+    password_hash_bulk_chunk_size: int = 16
+    user_bulk_max_rows: int = 5000
+    balance_snapshot_settle_seconds: float = 60
+    ledger_group_commit: bool = False
+    ledger_group_commit_max_batch: int = 256
+    ledger_group_commit_max_delay_ms: float = 2
+    provision_wallets_on_enrollment: bool = True
+    default_wallet_buckets: dict[str, float | None] = {"Needs": 50, "Wants": 30, "Goals": 20}
 
     class Config:
         env_file = ".env"
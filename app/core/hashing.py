@@ -0,0 +1,138 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from app.core.config import settings
+from app.core.security import get_password_hash, hash_passwords, verify_password
+
+
+class PasswordPoolSaturated(Exception):
+    pass
+
+
+class PasswordHasherPool:
+    """Dedicated executor for bcrypt work with a bounded backlog.
+
+    Hashing runs outside the AnyIO threadpool so a burst of logins cannot
+    starve unrelated requests. Once ``workers + max_queue`` jobs are in
+    flight, new submissions raise ``PasswordPoolSaturated`` instead of
+    queueing without bound.
+
+    Bulk hashing is split into chunks of ``bulk_chunk_size`` passwords and at
+    most ``workers - 1`` chunks run at once across all callers, so a roster
+    import always leaves a worker free and logins queue behind one chunk at
+    most rather than behind the whole import.
+    """
+
+    def __init__(
+        self, workers: int, max_queue: int, kind: str = "thread", bulk_chunk_size: int = 16
+    ) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported password hasher pool kind: {kind}")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.bulk_chunk_size = max(bulk_chunk_size, 1)
+        self.bulk_slots = max(workers - 1, 1)
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._bulk_semaphore: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    def _done(self, _: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def submit(self, fn, *args: Any) -> Future:
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolSaturated()
+            self.in_flight += 1
+            self.submitted += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(get_password_hash, password))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(
+            self.submit(verify_password, plain_password, hashed_password)
+        )
+
+    async def _hash_chunk(self, passwords: list[str]) -> list[str]:
+        if self._bulk_semaphore is None:
+            self._bulk_semaphore = asyncio.Semaphore(self.bulk_slots)
+        async with self._bulk_semaphore:
+            return await asyncio.wrap_future(self.submit(hash_passwords, passwords))
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """Hash ``passwords`` in small chunks on the bulk slots, preserving order."""
+        size = self.bulk_chunk_size
+        tasks = [
+            asyncio.ensure_future(self._hash_chunk(passwords[start : start + size]))
+            for start in range(0, len(passwords), size)
+        ]
+        try:
+            chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            # Drop the chunks still waiting for a slot once one fails.
+            for task in tasks:
+                task.cancel()
+            raise
+        return [hashed for chunk in chunks for hashed in chunk]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict[str, Any]:
+        busy = min(self.in_flight, self.workers)
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "busy": busy,
+            "queued": self.in_flight - busy,
+            "peak_in_flight": self.peak_in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "utilization": round(busy / self.workers, 4) if self.workers else 0.0,
+        }
+
+
+password_hasher = PasswordHasherPool(
+    workers=settings.password_hash_workers or os.cpu_count() or 1,
+    max_queue=settings.password_hash_max_queue,
+    kind=settings.password_hash_pool,
+    bulk_chunk_size=settings.password_hash_bulk_chunk_size,
+)
@@ -0,0 +1,109 @@
+import bisect
+import threading
+import time
+from collections.abc import Iterable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Histogram:
+    """Minimal Prometheus histogram keyed by a fixed tuple of label names."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+        for label_values, counts, total, count in sorted(snapshot):
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_labels({**labels, 'le': str(bound)})} {cumulative}"
+            yield f"{self.name}_sum{_labels(labels)} {total}"
+            yield f"{self.name}_count{_labels(labels)} {count}"
+
+
+def render_samples(
+    name: str, kind: str, documentation: str, samples: Iterable[tuple[dict[str, str], float]]
+) -> Iterable[str]:
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{_labels(labels)} {value}"
+
+
+request_duration = Histogram(
+    "endowal_http_request_duration_seconds",
+    "HTTP request latency by route template and status class.",
+    ("method", "route", "status"),
+)
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware feeding ``request_duration``.
+
+    Avoids ``BaseHTTPMiddleware`` so recording a request costs one histogram
+    update rather than an extra task and response stream per request.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - started_at,
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                f"{status_code // 100}xx",
+            )
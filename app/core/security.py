@@ -1,17 +1,30 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+token_cache = TTLCache(
+    "tokens",
+    maxsize=settings.token_cache_max_entries,
+    ttl=settings.access_token_expire_minutes * 60,
+)
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def hash_passwords(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -23,3 +36,21 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     )
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify ``token`` and return its claims, memoizing them until ``exp``.
+
+    Only tokens that passed signature verification are cached, keyed by a
+    SHA-256 digest so raw tokens are never held in memory. Raises
+    ``JWTError`` for invalid or expired tokens.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is not None and claims["exp"] > time.time():
+        return claims
+    claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, claims, ttl=exp - time.time())
+    return claims
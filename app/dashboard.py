@@ -0,0 +1,149 @@
+"""Classroom dashboard assembled from a fixed number of queries and cached per version.
+
+Every write that changes what a dashboard shows bumps its classroom's version
+after commit, so cached dashboards are keyed by ``(classroom_id, version, days)``
+and simply stop being read once stale. Ledger writes only know the wallet, so
+the wallet → classroom map of the dashboards built so far resolves them
+without a query; wallets that are not on a cached dashboard need no bump.
+"""
+
+import itertools
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import and_, func, select, union
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import Classroom, Enrollment, LedgerEntry, StudentWallet, User, WalletBucket
+from app.schemas.classroom import (
+    ClassroomDashboard,
+    ClassroomOut,
+    DashboardStudent,
+    DashboardWallet,
+    WalletActivity,
+)
+from app.schemas.wallet import WalletBucketOut
+
+dashboard_cache = TTLCache(
+    "classroom_dashboards",
+    maxsize=settings.dashboard_cache_max_entries,
+    ttl=settings.dashboard_cache_ttl_seconds,
+)
+
+_versions: dict[int, int] = {}
+_wallet_classrooms: dict[int, int] = {}
+_version_counter = itertools.count(1)
+
+
+def classroom_version(classroom_id: int) -> int:
+    return _versions.get(classroom_id, 0)
+
+
+def invalidate_dashboard(*classroom_ids: int | None) -> None:
+    for classroom_id in classroom_ids:
+        if classroom_id is not None:
+            _versions[classroom_id] = next(_version_counter)
+
+
+def invalidate_wallet_dashboards(*wallet_ids: int) -> None:
+    invalidate_dashboard(*{_wallet_classrooms.get(wallet_id) for wallet_id in wallet_ids})
+
+
+def _activity_statement(classroom_id: int, since: datetime):
+    return (
+        select(
+            LedgerEntry.wallet_id,
+            func.count(LedgerEntry.id).label("entries"),
+            func.coalesce(
+                func.sum(LedgerEntry.amount).filter(LedgerEntry.entry_type == "deposit"), 0
+            ).label("deposits"),
+            func.coalesce(
+                func.sum(LedgerEntry.amount).filter(LedgerEntry.entry_type == "withdrawal"), 0
+            ).label("withdrawals"),
+            func.max(LedgerEntry.created_at).label("last_entry_at"),
+        )
+        .where(
+            LedgerEntry.wallet_id.in_(
+                select(StudentWallet.id).where(StudentWallet.classroom_id == classroom_id)
+            ),
+            LedgerEntry.created_at >= since,
+        )
+        .group_by(LedgerEntry.wallet_id)
+        .subquery()
+    )
+
+
+def build_dashboard(db: Session, classroom: Classroom, since: datetime) -> ClassroomDashboard:
+    """Students, wallets with buckets, and ledger activity since ``since`` in three queries."""
+    activity = _activity_statement(classroom.id, since)
+    wallets = db.execute(
+        select(
+            StudentWallet,
+            activity.c.entries,
+            activity.c.deposits,
+            activity.c.withdrawals,
+            activity.c.last_entry_at,
+        )
+        .outerjoin(activity, activity.c.wallet_id == StudentWallet.id)
+        .where(StudentWallet.classroom_id == classroom.id)
+    ).all()
+
+    buckets = defaultdict(list)
+    for bucket in db.scalars(
+        select(WalletBucket)
+        .where(
+            WalletBucket.wallet_id.in_(
+                select(StudentWallet.id).where(StudentWallet.classroom_id == classroom.id)
+            )
+        )
+        .order_by(WalletBucket.id)
+    ):
+        buckets[bucket.wallet_id].append(WalletBucketOut.model_validate(bucket))
+
+    by_student = {}
+    for wallet, entries, deposits, withdrawals, last_entry_at in wallets:
+        _wallet_classrooms[wallet.id] = classroom.id
+        by_student[wallet.student_id] = DashboardWallet(
+            id=wallet.id,
+            classroom_id=wallet.classroom_id,
+            student_id=wallet.student_id,
+            balance=wallet.balance,
+            buckets=buckets[wallet.id],
+            activity=WalletActivity(
+                entries=entries or 0,
+                deposits=deposits or 0,
+                withdrawals=withdrawals or 0,
+                last_entry_at=last_entry_at,
+            ),
+        )
+
+    student_ids = union(
+        select(Enrollment.student_id).where(Enrollment.classroom_id == classroom.id),
+        select(StudentWallet.student_id).where(StudentWallet.classroom_id == classroom.id),
+    )
+    students = db.execute(
+        select(User.id, User.name, User.email, Enrollment.status)
+        .outerjoin(
+            Enrollment,
+            and_(Enrollment.student_id == User.id, Enrollment.classroom_id == classroom.id),
+        )
+        .where(User.id.in_(student_ids))
+        .order_by(User.name, User.id)
+    ).all()
+
+    return ClassroomDashboard(
+        classroom=ClassroomOut.model_validate(classroom),
+        activity_since=since,
+        students=[
+            DashboardStudent(
+                id=student_id,
+                name=name,
+                email=email,
+                enrollment_status=status,
+                wallet=by_student.get(student_id),
+            )
+            for student_id, name, email, status in students
+        ],
+    )
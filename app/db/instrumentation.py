@@ -0,0 +1,52 @@
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+
+from app.core.config import settings
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    duration: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+
+
+def begin_query_stats() -> tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_query_stats(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = conn.info["query_started_at"].pop()
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.duration += time.perf_counter() - started_at
+    stats.shapes[statement] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and DB time per request for ``engine``."""
+    if not settings.sql_instrumentation:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
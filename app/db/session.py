@@ -1,12 +1,95 @@
+from typing import Any
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 from app.db.base import Base
+from app.db.instrumentation import instrument_engine
+from app.db.pool import InstrumentedQueuePool, pool_status
+from app.db.sqlite import configure_sqlite
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+psycopg"}
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "future": True,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if _is_memory_sqlite(url):
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    return options
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
 
-engine = create_engine(settings.database_url, future=True)
+def async_engine_options(url: str) -> dict[str, Any]:
+    options = engine_options(url)
+    options.pop("future")
+    if "poolclass" in options:
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+configure_sqlite(engine)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.database_replica_url:
+    replica_engine = create_engine(
+        settings.database_replica_url, **engine_options(settings.database_replica_url)
+    )
+    configure_sqlite(replica_engine)
+    instrument_engine(replica_engine)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async_mode:
+    async_engine = create_async_engine(
+        async_database_url(settings.database_url),
+        **async_engine_options(settings.database_url),
+    )
+    configure_sqlite(async_engine.sync_engine)
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+def pool_statuses() -> dict[str, dict[str, Any]]:
+    pools = {"primary": pool_status(engine)}
+    if replica_engine is not None:
+        pools["replica"] = pool_status(replica_engine)
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine)
+    return pools
+
 
 def get_db():
     db = SessionLocal()
@@ -14,3 +97,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,27 @@
+from sqlalchemy import Engine, event
+
+from app.core.config import settings
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": -settings.sqlite_cache_size_kib,
+        "mmap_size": settings.sqlite_mmap_size,
+    }
+
+
+def configure_sqlite(engine: Engine, pragmas: dict[str, str | int] | None = None) -> None:
+    """Apply the single-node SQLite profile to every new connection."""
+    if engine.dialect.name != "sqlite" or not settings.sqlite_tuning:
+        return
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
@@ -1,40 +1,146 @@
-from fastapi import Depends, HTTPException, status
+import hashlib
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.security import decode_access_token
+from app.db.session import ReplicaSessionLocal, SessionLocal, get_async_db, get_db
 from app.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+principal_cache = TTLCache(
+    "principals",
+    maxsize=settings.principal_cache_max_entries,
+    ttl=settings.principal_cache_ttl_seconds,
+)
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
+primary_pins = TTLCache("primary_pins", maxsize=10000, ttl=settings.replica_pin_seconds)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Detached snapshot of the authenticated user, safe to share across sessions."""
+
+    id: int
+    email: str
+    name: str | None
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            role=user.role,
+            is_active=user.is_active,
+        )
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop(user_id)
+
+
+def _pin_key(request: Request) -> bytes | None:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).digest()
+
+
+def pin_to_primary(request: Request) -> None:
+    """Route this caller's reads to the primary for ``replica_pin_seconds``."""
+    key = _pin_key(request)
+    if key is not None:
+        primary_pins.set(key, True)
+
+
+def read_sessionmaker(request: Request) -> sessionmaker:
+    """The replica session factory unless none is configured or the caller just wrote."""
+    key = _pin_key(request)
+    if ReplicaSessionLocal is None or (key is not None and primary_pins.get(key)):
+        return SessionLocal
+    return ReplicaSessionLocal
+
+
+def get_read_db(request: Request):
+    """Session for read-only handlers: the replica unless the caller just wrote."""
+    factory = read_sessionmaker(request)
+    if factory is SessionLocal:
+        yield from get_db()
+        return
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _user_id_from_token(token: str) -> int:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = decode_access_token(token)
         user_id = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError as exc:
-        raise credentials_exception from exc
+        raise _credentials_exception() from exc
+    return int(user_id)
+
+
+def _resolve_principal(user: User | None) -> Principal:
+    if not user:
+        raise _credentials_exception()
+    principal = Principal.from_user(user)
+    principal_cache.set(user.id, principal)
+    return principal
+
 
-    user = db.get(User, int(user_id))
-    if not user or not user.is_active:
-        raise credentials_exception
-    return user
+def _ensure_active(principal: Principal) -> Principal:
+    if not principal.is_active:
+        raise _credentials_exception()
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    user_id = _user_id_from_token(token)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _resolve_principal(db.get(User, user_id))
+    return _ensure_active(principal)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    user_id = _user_id_from_token(token)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _resolve_principal(await db.get(User, user_id))
+    return _ensure_active(principal)
 
 
 def require_roles(*roles: str):
-    def checker(user: User = Depends(get_current_user)) -> User:
+    def checker(user: Principal = Depends(get_current_user)) -> Principal:
         if user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized"
@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.balances import apply_balance_deltas, signed_amount
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import LedgerEntry
+
+_STOP = object()
+
+
+class LedgerGroupCommitter:
+    """Write-behind queue that commits concurrent ledger appends together.
+
+    A single writer thread drains the queue for up to ``max_delay`` seconds or
+    ``max_batch`` entries, inserts them with one executemany, applies the
+    per-wallet balance deltas and commits once. Each caller's future resolves
+    only after that commit, so acknowledgements stay durable. If a batch fails,
+    its entries are retried one by one so one bad row fails only its own request.
+    """
+
+    def __init__(self, session_factory: sessionmaker, max_batch: int, max_delay: float) -> None:
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.entries = 0
+        self.failed = 0
+        self.largest_batch = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, values: dict[str, Any]) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ledger-group-commit", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((values, future))
+        return future
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch, stopping = self._collect(item)
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _write(self, rows: list[dict[str, Any]]) -> list[int]:
+        deltas: dict[int, Decimal] = defaultdict(Decimal)
+        for row in rows:
+            deltas[row["wallet_id"]] += signed_amount(row["entry_type"], row["amount"])
+        with self.session_factory() as db:
+            ids = list(
+                db.scalars(
+                    insert(LedgerEntry).returning(LedgerEntry.id, sort_by_parameter_order=True),
+                    rows,
+                )
+            )
+            apply_balance_deltas(db, deltas)
+            db.commit()
+        return ids
+
+    def _flush(self, batch: list) -> None:
+        try:
+            ids = self._write([values for values, _ in batch])
+        except Exception:
+            for values, future in batch:
+                try:
+                    future.set_result(self._write([values])[0])
+                except Exception as exc:
+                    self.failed += 1
+                    future.set_exception(exc)
+        else:
+            for (_, future), entry_id in zip(batch, ids):
+                future.set_result(entry_id)
+        self.batches += 1
+        self.entries += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": settings.ledger_group_commit,
+            "max_batch": self.max_batch,
+            "max_delay_ms": self.max_delay * 1000,
+            "batches": self.batches,
+            "entries": self.entries,
+            "failed": self.failed,
+            "largest_batch": self.largest_batch,
+            "mean_batch": round(self.entries / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+
+ledger_committer = LedgerGroupCommitter(
+    SessionLocal,
+    max_batch=settings.ledger_group_commit_max_batch,
+    max_delay=settings.ledger_group_commit_max_delay_ms / 1000,
+)
@@ -1,6 +1,20 @@
-from fastapi import FastAPI
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.hashing import PasswordPoolSaturated, password_hasher
+from app.core.metrics import RequestMetricsMiddleware
+from app.db.instrumentation import begin_query_stats, end_query_stats
+from app.db.session import ReplicaSessionLocal
+from app.deps import pin_to_primary
+from app.group_commit import ledger_committer
 from app.routes import (
+    admin_router,
     assignments_router,
     auth_router,
     budget_line_items_router,
@@ -9,11 +23,20 @@ from app.routes import (
     classrooms_router,
     enrollments_router,
     ledger_entries_router,
+    metrics_router,
     users_router,
     wallets_router,
 )
 
-app = FastAPI(title="Endowal API")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    ledger_committer.shutdown()
+    password_hasher.shutdown()
+
+
+app = FastAPI(title="Endowal API", lifespan=lifespan)
 
 app.include_router(auth_router)
 app.include_router(users_router)
@@ -25,6 +48,63 @@ app.include_router(buckets_router)
 app.include_router(ledger_entries_router)
 app.include_router(budget_submissions_router)
 app.include_router(budget_line_items_router)
+app.include_router(admin_router)
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
+    app.add_middleware(RequestMetricsMiddleware)
+
+logger = logging.getLogger("app.requests")
+
+if settings.sql_instrumentation:
+
+    @app.middleware("http")
+    async def record_sql_timing(request: Request, call_next):
+        stats, token = begin_query_stats()
+        started_at = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            end_query_stats(token)
+        elapsed = time.perf_counter() - started_at
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.duration * 1000:.2f};desc="{stats.statements} statements", '
+            f"app;dur={elapsed * 1000:.2f}"
+        )
+        record = {
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round(elapsed * 1000, 2),
+            "db_statements": stats.statements,
+            "db_duration_ms": round(stats.duration * 1000, 2),
+        }
+        logger.info(json.dumps(record))
+        if settings.sql_detect_n_plus_one:
+            repeated = stats.repeated(settings.sql_repeat_threshold)
+            if stats.statements > settings.sql_statement_budget or repeated:
+                logger.warning(
+                    json.dumps({**record, "event": "sql_budget_exceeded", "repeated": repeated})
+                )
+        return response
+
+
+if ReplicaSessionLocal is not None:
+
+    @app.middleware("http")
+    async def pin_writers_to_primary(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            pin_to_primary(request)
+        return response
+
+
+@app.exception_handler(PasswordPoolSaturated)
+async def password_pool_saturated_handler(request: Request, exc: PasswordPoolSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/health")
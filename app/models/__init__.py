@@ -2,9 +2,9 @@ from app.models.assignment import Assignment
 from app.models.budget import BudgetLineItem, BudgetSubmission
 from app.models.classroom import Classroom
 from app.models.enrollment import Enrollment
-from app.models.ledger import LedgerEntry
+from app.models.ledger import ArchivedLedgerEntry, LedgerEntry
 from app.models.user import User
-from app.models.wallet import StudentWallet, WalletBucket
+from app.models.wallet import StudentWallet, WalletBalanceSnapshot, WalletBucket
 
 __all__ = [
     "User",
@@ -13,7 +13,9 @@ __all__ = [
     "Assignment",
     "StudentWallet",
     "WalletBucket",
+    "WalletBalanceSnapshot",
     "LedgerEntry",
+    "ArchivedLedgerEntry",
     "BudgetSubmission",
     "BudgetLineItem",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Enum, Integer, Numeric, String, Text, UniqueConstraint
+from sqlalchemy import Enum, Index, Integer, Numeric, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -8,11 +8,13 @@ class BudgetSubmission(Base):
     __tablename__ = "budget_submissions"
     __table_args__ = (
         UniqueConstraint("assignment_id", "student_id", name="uq_submission_assignment_student"),
+        Index("ix_budget_submissions_assignment_id_id", "assignment_id", "id"),
+        Index("ix_budget_submissions_student_id_id", "student_id", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    assignment_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
-    student_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    assignment_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    student_id: Mapped[int] = mapped_column(Integer, nullable=False)
     total_planned: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
     notes: Mapped[str | None] = mapped_column(Text)
     status: Mapped[str] = mapped_column(
@@ -1,14 +1,18 @@
-from sqlalchemy import Enum, Integer, Numeric, String
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Enum, Index, Integer, Numeric, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
 
 
-class LedgerEntry(Base):
-    __tablename__ = "ledger_entries"
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
+
+class LedgerEntryColumns:
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    wallet_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    wallet_id: Mapped[int] = mapped_column(Integer, nullable=False)
     assignment_id: Mapped[int | None] = mapped_column(Integer, index=True)
     amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
     entry_type: Mapped[str] = mapped_column(
@@ -20,3 +24,31 @@ class LedgerEntry(Base):
         nullable=False,
     )
     memo: Mapped[str | None] = mapped_column(String(255))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=utcnow, server_default=func.now()
+    )
+
+
+class LedgerEntry(LedgerEntryColumns, Base):
+    __tablename__ = "ledger_entries"
+    __table_args__ = (
+        Index("ix_ledger_entries_wallet_id_id", "wallet_id", "id"),
+        Index("ix_ledger_entries_wallet_id_created_at", "wallet_id", "created_at"),
+        # Archived entries keep their ids, so SQLite must never hand them out again.
+        {"sqlite_autoincrement": True},
+    )
+
+
+class ArchivedLedgerEntry(LedgerEntryColumns, Base):
+    """Cold copy of entries moved out of ``ledger_entries``; ids are preserved."""
+
+    __tablename__ = "ledger_entries_archive"
+    __table_args__ = (
+        Index("ix_ledger_entries_archive_wallet_id_id", "wallet_id", "id"),
+        Index("ix_ledger_entries_archive_wallet_id_created_at", "wallet_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=utcnow, server_default=func.now()
+    )
@@ -1,4 +1,6 @@
-from sqlalchemy import Integer, Numeric, String, UniqueConstraint
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -8,11 +10,13 @@ class StudentWallet(Base):
     __tablename__ = "student_wallets"
     __table_args__ = (
         UniqueConstraint("classroom_id", "student_id", name="uq_wallet_class_student"),
+        Index("ix_student_wallets_classroom_id_id", "classroom_id", "id"),
+        Index("ix_student_wallets_student_id_id", "student_id", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    classroom_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
-    student_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    classroom_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    student_id: Mapped[int] = mapped_column(Integer, nullable=False)
     balance: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False, default=0)
 
 
@@ -26,3 +30,18 @@ class WalletBucket(Base):
     wallet_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(80), nullable=False)
     percent_target: Mapped[float | None] = mapped_column(Numeric(5, 2))
+    balance: Mapped[float] = mapped_column(
+        Numeric(12, 2), nullable=False, default=0, server_default="0"
+    )
+
+
+class WalletBalanceSnapshot(Base):
+    __tablename__ = "wallet_balance_snapshots"
+    __table_args__ = (
+        UniqueConstraint("wallet_id", "as_of", name="uq_snapshot_wallet_as_of"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    wallet_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    as_of: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    balance: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
@@ -0,0 +1,43 @@
+import base64
+from collections.abc import Sequence
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError(cursor)
+        return int(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def paginate(query, column, skip: int, limit: int, cursor: str | None):
+    """Order ``query`` by ``column`` and page it by cursor, falling back to offset.
+
+    One extra row is fetched so ``next_page`` can tell whether another page
+    exists. Other limits (0, negative) are passed through unchanged.
+    """
+    query = query.order_by(column)
+    if cursor is not None:
+        query = query.where(column > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit + 1 if limit > 0 else limit)
+
+
+def next_page(response: Response, rows: Sequence, limit: int) -> list:
+    rows = list(rows)
+    if limit > 0 and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
+    return rows
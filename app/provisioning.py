@@ -0,0 +1,43 @@
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import StudentWallet, WalletBucket
+
+
+def provision_wallets(db: Session, classroom_id: int, student_ids: list[int]) -> list[int]:
+    """Create a wallet and the default buckets for each student still without one.
+
+    One SELECT finds existing wallets, one multi-row INSERT creates the rest and
+    one more adds ``settings.default_wallet_buckets`` to every new wallet. The
+    caller commits, then evicts the classroom owners' teacher index.
+    """
+    existing = set(
+        db.scalars(
+            select(StudentWallet.student_id).where(
+                StudentWallet.classroom_id == classroom_id,
+                StudentWallet.student_id.in_(student_ids),
+            )
+        )
+    )
+    missing = sorted(set(student_ids) - existing)
+    if not missing:
+        return []
+    # Unordered RETURNING keeps this one multi-row INSERT on SQLite as well.
+    wallet_ids = sorted(
+        db.scalars(
+            insert(StudentWallet).returning(StudentWallet.id),
+            [
+                {"classroom_id": classroom_id, "student_id": student_id, "balance": 0}
+                for student_id in missing
+            ],
+        )
+    )
+    buckets = [
+        {"wallet_id": wallet_id, "name": name, "percent_target": percent_target}
+        for wallet_id in wallet_ids
+        for name, percent_target in settings.default_wallet_buckets.items()
+    ]
+    if buckets:
+        db.execute(insert(WalletBucket), buckets)
+    return wallet_ids
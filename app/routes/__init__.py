@@ -1,3 +1,4 @@
+from app.routes.admin import router as admin_router
 from app.routes.assignments import router as assignments_router
 from app.routes.auth import router as auth_router
 from app.routes.budget_line_items import router as budget_line_items_router
@@ -6,10 +7,12 @@ from app.routes.buckets import router as buckets_router
 from app.routes.classrooms import router as classrooms_router
 from app.routes.enrollments import router as enrollments_router
 from app.routes.ledger_entries import router as ledger_entries_router
+from app.routes.metrics import router as metrics_router
 from app.routes.users import router as users_router
 from app.routes.wallets import router as wallets_router
 
 __all__ = [
+    "admin_router",
     "assignments_router",
     "auth_router",
     "budget_line_items_router",
@@ -18,6 +21,7 @@ __all__ = [
     "classrooms_router",
     "enrollments_router",
     "ledger_entries_router",
+    "metrics_router",
     "users_router",
     "wallets_router",
 ]
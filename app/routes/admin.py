@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+
+from app.core.cache import cache_stats
+from app.core.hashing import password_hasher
+from app.db.session import pool_statuses
+from app.deps import Principal, require_roles
+from app.group_commit import ledger_committer
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/caches")
+def get_cache_stats(_: Principal = Depends(require_roles("admin"))):
+    return cache_stats()
+
+
+@router.get("/password-hasher")
+def get_password_hasher_stats(_: Principal = Depends(require_roles("admin"))):
+    return password_hasher.stats()
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(_: Principal = Depends(require_roles("admin"))):
+    return pool_statuses()
+
+
+@router.get("/ledger-group-commit")
+def get_ledger_group_commit_stats(_: Principal = Depends(require_roles("admin"))):
+    return ledger_committer.stats()
@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.deps import get_current_user, require_roles
-from app.models import Assignment, User
+from app.deps import Principal, get_current_user, get_read_db, require_roles
+from app.models import Assignment
 from app.schemas.assignment import AssignmentCreate, AssignmentOut, AssignmentUpdate
 
 router = APIRouter(prefix="/assignments", tags=["assignments"])
@@ -23,8 +23,8 @@ def list_assignments(
     classroom_id: int | None = None,
     created_by: int | None = None,
     status_filter: str | None = None,
-    db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_user),
 ):
     query = db.query(Assignment)
     if classroom_id is not None:
@@ -40,7 +40,7 @@ def list_assignments(
 def create_assignment(
     payload: AssignmentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
     data = payload.model_dump()
     if current_user.role == "teacher":
@@ -55,8 +55,8 @@ def create_assignment(
 @router.get("/{assignment_id}", response_model=AssignmentOut)
 def get_assignment(
     assignment_id: int,
-    db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_user),
 ):
     return _get_or_404(db, assignment_id)
 
@@ -66,7 +66,7 @@ def update_assignment(
     assignment_id: int,
     payload: AssignmentUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
     assignment = _get_or_404(db, assignment_id)
     if current_user.role == "teacher" and assignment.created_by != current_user.id:
@@ -83,7 +83,7 @@ def update_assignment(
 def delete_assignment(
     assignment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
     assignment = _get_or_404(db, assignment_id)
     if current_user.role == "teacher" and assignment.created_by != current_user.id:
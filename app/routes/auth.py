@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token, get_password_hash, verify_password
-from app.deps import get_current_user
+from app.core.hashing import password_hasher
+from app.core.security import create_access_token
+from app.deps import Principal, get_current_user
 from app.db.session import get_db
 from app.models import User
 from app.schemas.auth import LoginRequest, Token
@@ -11,9 +13,20 @@ from app.schemas.user import UserCreate, UserOut
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _get_by_email(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == payload.email).first()
+async def register(payload: UserCreate, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(_get_by_email, db, payload.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
@@ -23,18 +36,15 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
         name=payload.name,
         role=role,
         is_active=payload.is_active,
-        password_hash=get_password_hash(payload.password),
+        password_hash=await password_hasher.hash(payload.password),
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_save, db, user)
 
 
 @router.post("/login", response_model=Token)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_get_by_email, db, payload.email)
+    if not user or not await password_hasher.verify(payload.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User is inactive")
@@ -44,5 +54,5 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)):
+def me(current_user: Principal = Depends(get_current_user)):
     return current_user
@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.deps import get_current_user
-from app.models import Assignment, BudgetLineItem, BudgetSubmission, User
+from app.deps import Principal, get_current_user, get_read_db
+from app.models import Assignment, BudgetLineItem, BudgetSubmission
 from app.schemas.budget import (
     BudgetLineItemCreate,
     BudgetLineItemOut,
@@ -28,7 +28,7 @@ def _get_submission_or_404(db: Session, submission_id: int) -> BudgetSubmission:
 
 
 def _ensure_submission_access(
-    db: Session, submission: BudgetSubmission, current_user: User
+    db: Session, submission: BudgetSubmission, current_user: Principal
 ) -> None:
     if current_user.role == "student" and submission.student_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
@@ -45,8 +45,8 @@ def list_line_items(
     skip: int = 0,
     limit: int = 100,
     submission_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     query = db.query(BudgetLineItem)
     if submission_id is None and current_user.role != "admin":
@@ -62,7 +62,7 @@ def list_line_items(
 def create_line_item(
     payload: BudgetLineItemCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     submission = _get_submission_or_404(db, payload.submission_id)
     _ensure_submission_access(db, submission, current_user)
@@ -76,8 +76,8 @@ def create_line_item(
 @router.get("/{item_id}", response_model=BudgetLineItemOut)
 def get_line_item(
     item_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     item = _get_or_404(db, item_id)
     submission = _get_submission_or_404(db, item.submission_id)
@@ -90,7 +90,7 @@ def update_line_item(
     item_id: int,
     payload: BudgetLineItemUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     item = _get_or_404(db, item_id)
     submission = _get_submission_or_404(db, item.submission_id)
@@ -107,7 +107,7 @@ def update_line_item(
 def delete_line_item(
     item_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     item = _get_or_404(db, item_id)
     submission = _get_submission_or_404(db, item.submission_id)
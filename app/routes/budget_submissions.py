@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.deps import get_current_user, require_roles
-from app.models import Assignment, BudgetSubmission, User
+from app.deps import Principal, get_current_user, get_read_db, require_roles
+from app.models import Assignment, BudgetLineItem, BudgetSubmission
+from app.pagination import next_page, paginate
 from app.schemas.budget import (
+    BudgetLineItemDraft,
+    BudgetLineItemOut,
     BudgetSubmissionCreate,
+    BudgetSubmissionItemsReplace,
     BudgetSubmissionOut,
     BudgetSubmissionUpdate,
+    BudgetSubmissionWithItemsCreate,
+    BudgetSubmissionWithItemsOut,
 )
 
 router = APIRouter(prefix="/budget-submissions", tags=["budget-submissions"])
@@ -28,7 +38,7 @@ def _get_assignment_or_404(db: Session, assignment_id: int) -> Assignment:
 
 
 def _ensure_assignment_access(
-    db: Session, assignment_id: int, current_user: User
+    db: Session, assignment_id: int, current_user: Principal
 ) -> Assignment:
     assignment = _get_assignment_or_404(db, assignment_id)
     if current_user.role == "teacher" and assignment.created_by != current_user.id:
@@ -36,14 +46,50 @@ def _ensure_assignment_access(
     return assignment
 
 
+def _line_item_rows(submission_id: int, items: list[BudgetLineItemDraft]) -> list[dict]:
+    return [
+        {"submission_id": submission_id, "category": item.category, "amount": item.amount}
+        for item in items
+    ]
+
+
+def _total_planned(items: list[BudgetLineItemDraft]) -> Decimal:
+    return sum((Decimal(str(item.amount)) for item in items), Decimal(0)).quantize(Decimal("0.01"))
+
+
+def _insert_line_items(
+    db: Session, submission_id: int, items: list[BudgetLineItemDraft]
+) -> list[BudgetLineItem]:
+    if not items:
+        return []
+    return sorted(
+        db.scalars(
+            insert(BudgetLineItem).returning(BudgetLineItem),
+            _line_item_rows(submission_id, items),
+        ),
+        key=lambda item: item.id,
+    )
+
+
+def _with_items(
+    submission: BudgetSubmission, items: list[BudgetLineItem]
+) -> BudgetSubmissionWithItemsOut:
+    return BudgetSubmissionWithItemsOut(
+        **BudgetSubmissionOut.model_validate(submission).model_dump(),
+        line_items=[BudgetLineItemOut.model_validate(item) for item in items],
+    )
+
+
 @router.get("", response_model=list[BudgetSubmissionOut])
 def list_submissions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     assignment_id: int | None = None,
     student_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     query = db.query(BudgetSubmission)
     if current_user.role == "student":
@@ -61,14 +107,15 @@ def list_submissions(
         query = query.filter(BudgetSubmission.assignment_id == assignment_id)
     if student_id is not None:
         query = query.filter(BudgetSubmission.student_id == student_id)
-    return query.offset(skip).limit(limit).all()
+    query = paginate(query, BudgetSubmission.id, skip, limit, cursor)
+    return next_page(response, query.all(), limit)
 
 
 @router.post("", response_model=BudgetSubmissionOut, status_code=status.HTTP_201_CREATED)
 def create_submission(
     payload: BudgetSubmissionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     data = payload.model_dump()
     _ensure_assignment_access(db, data["assignment_id"], current_user)
@@ -81,11 +128,47 @@ def create_submission(
     return submission
 
 
+@router.post(
+    "/with-line-items",
+    response_model=BudgetSubmissionWithItemsOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_submission_with_line_items(
+    payload: BudgetSubmissionWithItemsCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    data = payload.model_dump(exclude={"line_items"})
+    _ensure_assignment_access(db, data["assignment_id"], current_user)
+    if current_user.role == "student":
+        data["student_id"] = current_user.id
+    total_planned = _total_planned(payload.line_items)
+    if data["total_planned"] is not None and (
+        Decimal(str(data["total_planned"])).quantize(Decimal("0.01")) != total_planned
+    ):
+        raise HTTPException(status_code=400, detail="total_planned does not match the line items")
+    data["total_planned"] = total_planned
+    submission = BudgetSubmission(**data)
+    db.add(submission)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Submission already exists for this assignment and student",
+        ) from exc
+    # Serialize before commit so the expired rows are not reloaded one by one.
+    result = _with_items(submission, _insert_line_items(db, submission.id, payload.line_items))
+    db.commit()
+    return result
+
+
 @router.get("/{submission_id}", response_model=BudgetSubmissionOut)
 def get_submission(
     submission_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     submission = _get_or_404(db, submission_id)
     if current_user.role == "student" and submission.student_id != current_user.id:
@@ -100,7 +183,7 @@ def update_submission(
     submission_id: int,
     payload: BudgetSubmissionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     submission = _get_or_404(db, submission_id)
     if current_user.role == "student" and submission.student_id != current_user.id:
@@ -119,7 +202,7 @@ def update_submission(
 def delete_submission(
     submission_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     submission = _get_or_404(db, submission_id)
     if current_user.role == "student" and submission.student_id != current_user.id:
@@ -129,3 +212,25 @@ def delete_submission(
     db.delete(submission)
     db.commit()
     return None
+
+
+@router.put("/{submission_id}/line-items", response_model=BudgetSubmissionWithItemsOut)
+def replace_submission_line_items(
+    submission_id: int,
+    payload: BudgetSubmissionItemsReplace,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    submission = _get_or_404(db, submission_id)
+    if current_user.role == "student" and submission.student_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if current_user.role == "teacher":
+        _ensure_assignment_access(db, submission.assignment_id, current_user)
+    db.execute(delete(BudgetLineItem).where(BudgetLineItem.submission_id == submission_id))
+    submission.total_planned = _total_planned(payload.line_items)
+    updates = payload.model_dump(exclude_unset=True, exclude={"line_items"})
+    for key, value in updates.items():
+        setattr(submission, key, value)
+    result = _with_items(submission, _insert_line_items(db, submission_id, payload.line_items))
+    db.commit()
+    return result
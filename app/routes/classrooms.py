@@ -1,10 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import timedelta
+from hashlib import sha256
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
+from app.access import ensure_classroom_access, invalidate_teacher_index
+from app.allocation import reallocate_buckets
+from app.balances import apply_balance_delta_many, signed_amount
+from app.dashboard import (
+    build_dashboard,
+    classroom_version,
+    dashboard_cache,
+    invalidate_dashboard,
+)
 from app.db.session import get_db
-from app.deps import get_current_user, require_roles
-from app.models import Classroom, User
-from app.schemas.classroom import ClassroomCreate, ClassroomOut, ClassroomUpdate
+from app.deps import Principal, get_current_user, get_read_db, require_roles
+from app.models import Classroom, LedgerEntry, StudentWallet
+from app.models.ledger import utcnow
+from app.schemas.classroom import (
+    ClassroomCreate,
+    ClassroomDashboard,
+    ClassroomOut,
+    ClassroomUpdate,
+)
+from app.schemas.ledger import ClassroomGrantCreate, ClassroomGrantResult
+from app.schemas.wallet import BucketReallocationResult
 
 router = APIRouter(prefix="/classrooms", tags=["classrooms"])
 
@@ -21,8 +42,8 @@ def list_classrooms(
     skip: int = 0,
     limit: int = 100,
     teacher_id: int | None = None,
-    db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_user),
 ):
     query = db.query(Classroom)
     if teacher_id is not None:
@@ -34,7 +55,7 @@ def list_classrooms(
 def create_classroom(
     payload: ClassroomCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
     data = payload.model_dump()
     if current_user.role == "teacher":
@@ -43,33 +64,66 @@ def create_classroom(
     db.add(classroom)
     db.commit()
     db.refresh(classroom)
+    invalidate_teacher_index(classroom.teacher_id)
     return classroom
 
 
 @router.get("/{classroom_id}", response_model=ClassroomOut)
 def get_classroom(
     classroom_id: int,
-    db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(get_current_user),
 ):
     return _get_or_404(db, classroom_id)
 
 
+@router.get("/{classroom_id}/dashboard", response_model=ClassroomDashboard)
+def get_classroom_dashboard(
+    classroom_id: int,
+    request: Request,
+    response: Response,
+    days: int = 7,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
+):
+    if not 1 <= days <= 90:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 90")
+    ensure_classroom_access(db, classroom_id, current_user)
+    # Read the version before building so a write that lands meanwhile bumps past it.
+    key = (classroom_id, classroom_version(classroom_id), days)
+    cached = dashboard_cache.get(key)
+    if cached is None:
+        dashboard = build_dashboard(
+            db, _get_or_404(db, classroom_id), utcnow() - timedelta(days=days)
+        )
+        etag = f'"{sha256(dashboard.model_dump_json().encode()).hexdigest()[:32]}"'
+        cached = (dashboard, etag)
+        dashboard_cache.set(key, cached)
+    dashboard, etag = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return dashboard
+
+
 @router.patch("/{classroom_id}", response_model=ClassroomOut)
 def update_classroom(
     classroom_id: int,
     payload: ClassroomUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
     classroom = _get_or_404(db, classroom_id)
     if current_user.role == "teacher" and classroom.teacher_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     updates = payload.model_dump(exclude_unset=True)
+    previous_teacher_id = classroom.teacher_id
     for key, value in updates.items():
         setattr(classroom, key, value)
     db.commit()
     db.refresh(classroom)
+    invalidate_teacher_index(previous_teacher_id, classroom.teacher_id)
+    invalidate_dashboard(classroom_id)
     return classroom
 
 
@@ -77,11 +131,82 @@ def update_classroom(
 def delete_classroom(
     classroom_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
     classroom = _get_or_404(db, classroom_id)
     if current_user.role == "teacher" and classroom.teacher_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
+    teacher_id = classroom.teacher_id
     db.delete(classroom)
     db.commit()
+    invalidate_teacher_index(teacher_id)
+    invalidate_dashboard(classroom_id)
     return None
+
+
+@router.post(
+    "/{classroom_id}/grants",
+    response_model=ClassroomGrantResult,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_classroom_grant(
+    classroom_id: int,
+    payload: ClassroomGrantCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
+):
+    ensure_classroom_access(db, classroom_id, current_user)
+    query = select(StudentWallet.id, StudentWallet.student_id).where(
+        StudentWallet.classroom_id == classroom_id
+    )
+    if payload.student_ids is not None:
+        query = query.where(StudentWallet.student_id.in_(payload.student_ids))
+    wallets = db.execute(query.order_by(StudentWallet.id)).all()
+    if payload.student_ids is not None:
+        missing = sorted(set(payload.student_ids) - {student_id for _, student_id in wallets})
+        if missing:
+            raise HTTPException(
+                status_code=404, detail=f"No wallet in this classroom for students {missing}"
+            )
+    wallet_ids = [wallet_id for wallet_id, _ in wallets]
+    if not wallet_ids:
+        return ClassroomGrantResult(classroom_id=classroom_id, posted=0, wallet_ids=[], entry_ids=[])
+
+    entry_ids = list(
+        db.scalars(
+            insert(LedgerEntry).returning(LedgerEntry.id, sort_by_parameter_order=True),
+            [
+                {
+                    "wallet_id": wallet_id,
+                    "assignment_id": payload.assignment_id,
+                    "amount": payload.amount,
+                    "entry_type": payload.entry_type,
+                    "source": "teacher_grant",
+                    "memo": payload.memo,
+                }
+                for wallet_id in wallet_ids
+            ],
+        )
+    )
+    apply_balance_delta_many(db, wallet_ids, signed_amount(payload.entry_type, payload.amount))
+    db.commit()
+    invalidate_dashboard(classroom_id)
+    return ClassroomGrantResult(
+        classroom_id=classroom_id,
+        posted=len(entry_ids),
+        wallet_ids=wallet_ids,
+        entry_ids=entry_ids,
+    )
+
+
+@router.post("/{classroom_id}/bucket-reallocation", response_model=BucketReallocationResult)
+def reallocate_classroom_buckets(
+    classroom_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
+):
+    ensure_classroom_access(db, classroom_id, current_user)
+    buckets = reallocate_buckets(db, classroom_id=classroom_id)
+    db.commit()
+    invalidate_dashboard(classroom_id)
+    return BucketReallocationResult(classroom_id=classroom_id, buckets=buckets)
@@ -1,10 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
+from app.access import classroom_owners, ensure_classroom_access, invalidate_teacher_index
+from app.core.config import settings
+from app.dashboard import invalidate_dashboard
 from app.db.session import get_db
-from app.deps import get_current_user, require_roles
+from app.deps import Principal, get_current_user, get_read_db, require_roles
 from app.models import Enrollment, User
-from app.schemas.enrollment import EnrollmentCreate, EnrollmentOut, EnrollmentUpdate
+from app.provisioning import provision_wallets
+from app.schemas.enrollment import (
+    EnrollmentBulkCreate,
+    EnrollmentBulkResult,
+    EnrollmentCreate,
+    EnrollmentOut,
+    EnrollmentUpdate,
+)
 
 router = APIRouter(prefix="/enrollments", tags=["enrollments"])
 
@@ -22,8 +33,8 @@ def list_enrollments(
     limit: int = 100,
     classroom_id: int | None = None,
     student_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role == "student":
         if student_id is not None and student_id != current_user.id:
@@ -41,20 +52,106 @@ def list_enrollments(
 def create_enrollment(
     payload: EnrollmentCreate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
+    ensure_classroom_access(db, payload.classroom_id, current_user)
+    student = db.get(User, payload.student_id)
+    if student is not None and student.role != "student":
+        raise HTTPException(status_code=400, detail="Only students can be enrolled")
     enrollment = Enrollment(**payload.model_dump())
     db.add(enrollment)
+    owners = []
+    if settings.provision_wallets_on_enrollment and enrollment.status == "active":
+        db.flush()
+        if provision_wallets(db, enrollment.classroom_id, [enrollment.student_id]):
+            owners = classroom_owners(db, enrollment.classroom_id)
     db.commit()
+    invalidate_teacher_index(*owners)
     db.refresh(enrollment)
+    invalidate_dashboard(enrollment.classroom_id)
     return enrollment
 
 
+@router.post("/bulk", response_model=EnrollmentBulkResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_enrollments(
+    payload: EnrollmentBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
+):
+    if len(payload.student_ids) > settings.user_bulk_max_rows:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.user_bulk_max_rows} students per request",
+        )
+    ensure_classroom_access(db, payload.classroom_id, current_user)
+    student_ids = sorted(set(payload.student_ids))
+    roles = dict(db.execute(select(User.id, User.role).where(User.id.in_(student_ids))).all())
+    missing = sorted(set(student_ids) - set(roles))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Users not found: {missing}")
+    not_students = sorted(user_id for user_id, role in roles.items() if role != "student")
+    if not_students:
+        raise HTTPException(
+            status_code=400, detail=f"Only students can be enrolled: {not_students}"
+        )
+    enrollment_statuses = dict(
+        db.execute(
+            select(Enrollment.student_id, Enrollment.status).where(
+                Enrollment.classroom_id == payload.classroom_id,
+                Enrollment.student_id.in_(student_ids),
+            )
+        ).all()
+    )
+    already_enrolled = set(enrollment_statuses)
+    new_ids = [student_id for student_id in student_ids if student_id not in already_enrolled]
+    enrollments = []
+    if new_ids:
+        enrollments = sorted(
+            db.scalars(
+                insert(Enrollment).returning(Enrollment),
+                [
+                    {
+                        "classroom_id": payload.classroom_id,
+                        "student_id": student_id,
+                        "status": payload.status,
+                    }
+                    for student_id in new_ids
+                ],
+            ),
+            key=lambda enrollment: enrollment.student_id,
+        )
+    wallet_ids, owners = [], []
+    if settings.provision_wallets_on_enrollment:
+        # Only students whose enrollment in the classroom ends up active get a wallet.
+        active_ids = sorted(
+            [student_id for student_id in new_ids if payload.status == "active"]
+            + [
+                student_id
+                for student_id, enrollment_status in enrollment_statuses.items()
+                if enrollment_status == "active"
+            ]
+        )
+        if active_ids:
+            wallet_ids = provision_wallets(db, payload.classroom_id, active_ids)
+        if wallet_ids:
+            owners = classroom_owners(db, payload.classroom_id)
+    result = EnrollmentBulkResult(
+        classroom_id=payload.classroom_id,
+        enrollments=[EnrollmentOut.model_validate(enrollment) for enrollment in enrollments],
+        already_enrolled=sorted(already_enrolled),
+        wallet_ids=wallet_ids,
+    )
+    db.commit()
+    invalidate_teacher_index(*owners)
+    invalidate_dashboard(payload.classroom_id)
+    return result
+
+
 @router.get("/{enrollment_id}", response_model=EnrollmentOut)
 def get_enrollment(
     enrollment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     enrollment = _get_or_404(db, enrollment_id)
     if current_user.role == "student" and enrollment.student_id != current_user.id:
@@ -67,7 +164,7 @@ def update_enrollment(
     enrollment_id: int,
     payload: EnrollmentUpdate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles("teacher", "admin")),
+    _: Principal = Depends(require_roles("teacher", "admin")),
 ):
     enrollment = _get_or_404(db, enrollment_id)
     updates = payload.model_dump(exclude_unset=True)
@@ -75,6 +172,7 @@ def update_enrollment(
         setattr(enrollment, key, value)
     db.commit()
     db.refresh(enrollment)
+    invalidate_dashboard(enrollment.classroom_id)
     return enrollment
 
 
@@ -82,9 +180,11 @@ def update_enrollment(
 def delete_enrollment(
     enrollment_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles("teacher", "admin")),
+    _: Principal = Depends(require_roles("teacher", "admin")),
 ):
     enrollment = _get_or_404(db, enrollment_id)
+    classroom_id = enrollment.classroom_id
     db.delete(enrollment)
     db.commit()
+    invalidate_dashboard(classroom_id)
     return None
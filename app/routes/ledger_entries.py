@@ -1,96 +1,336 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
 
-from app.db.session import get_db
-from app.deps import get_current_user, require_roles
-from app.models import Classroom, LedgerEntry, StudentWallet, User
-from app.schemas.ledger import LedgerEntryCreate, LedgerEntryOut, LedgerEntryUpdate
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.access import (
+    TeacherIndex,
+    authorize_wallet,
+    authorize_wallet_async,
+    ensure_classroom_access,
+    get_entry_with_access,
+    get_teacher_index,
+    get_teacher_index_async,
+)
+from app.archive import ledger_source
+from app.balances import apply_balance_delta, invalidate_snapshots, signed_amount
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.dashboard import invalidate_wallet_dashboards
+from app.db.session import get_async_db, get_db
+from app.deps import (
+    Principal,
+    get_current_user,
+    get_current_user_async,
+    get_read_db,
+    read_sessionmaker,
+    require_roles,
+)
+from app.group_commit import ledger_committer
+from app.models import LedgerEntry, StudentWallet
+from app.models.ledger import utcnow
+from app.pagination import next_page, paginate
+from app.schemas.ledger import (
+    LedgerEntryCreate,
+    LedgerEntryOut,
+    LedgerEntryUpdate,
+    LedgerSummaryRow,
+)
 
 router = APIRouter(prefix="/ledger-entries", tags=["ledger-entries"])
 
+summary_cache = TTLCache(
+    "ledger_summaries",
+    maxsize=settings.ledger_summary_cache_max_entries,
+    ttl=settings.ledger_summary_cache_ttl_seconds,
+)
 
-def _get_or_404(db: Session, entry_id: int) -> LedgerEntry:
-    entry = db.get(LedgerEntry, entry_id)
-    if not entry:
-        raise HTTPException(status_code=404, detail="Ledger entry not found")
-    return entry
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "id",
+    "wallet_id",
+    "assignment_id",
+    "amount",
+    "entry_type",
+    "source",
+    "memo",
+    "created_at",
+)
 
 
-def _ensure_classroom_access(db: Session, classroom_id: int, current_user: User) -> None:
-    classroom = db.get(Classroom, classroom_id)
-    if not classroom:
-        raise HTTPException(status_code=404, detail="Classroom not found")
-    if current_user.role == "teacher" and classroom.teacher_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def _scope(
+    query: Select,
+    entry,
+    current_user: Principal,
+    wallet_id: int | None,
+    assignment_id: int | None,
+    teacher_index: TeacherIndex | None = None,
+    classroom_id: int | None = None,
+) -> Select:
+    if current_user.role == "student":
+        query = query.where(
+            entry.wallet_id.in_(
+                select(StudentWallet.id).where(StudentWallet.student_id == current_user.id)
+            )
+        )
+    if teacher_index is not None:
+        query = query.where(entry.wallet_id.in_(sorted(teacher_index.wallet_ids)))
+    if wallet_id is not None:
+        query = query.where(entry.wallet_id == wallet_id)
+    if assignment_id is not None:
+        query = query.where(entry.assignment_id == assignment_id)
+    if classroom_id is not None:
+        query = query.where(
+            entry.wallet_id.in_(
+                select(StudentWallet.id).where(StudentWallet.classroom_id == classroom_id)
+            )
+        )
+    return query
 
 
-def _get_wallet_or_404(db: Session, wallet_id: int) -> StudentWallet:
-    wallet = db.get(StudentWallet, wallet_id)
-    if not wallet:
-        raise HTTPException(status_code=404, detail="Wallet not found")
-    return wallet
+def _authorize_filters(
+    db: Session, current_user: Principal, wallet_id: int | None, classroom_id: int | None
+) -> TeacherIndex | None:
+    teacher_index = None
+    if current_user.role == "teacher":
+        teacher_index = get_teacher_index(db, current_user.id)
+        if classroom_id is not None:
+            ensure_classroom_access(db, classroom_id, current_user)
+    if wallet_id is not None:
+        authorize_wallet(db, wallet_id, current_user)
+    return teacher_index
 
 
-def _ensure_wallet_access(db: Session, wallet: StudentWallet, current_user: User) -> None:
-    if current_user.role == "student" and wallet.student_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    if current_user.role == "teacher":
-        _ensure_classroom_access(db, wallet.classroom_id, current_user)
+def _list_statement(
+    entry,
+    current_user: Principal,
+    wallet_id: int | None,
+    assignment_id: int | None,
+    teacher_index: TeacherIndex | None = None,
+) -> Select:
+    return _scope(select(entry), entry, current_user, wallet_id, assignment_id, teacher_index)
 
 
-@router.get("", response_model=list[LedgerEntryOut])
 def list_ledger_entries(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     wallet_id: int | None = None,
     assignment_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    query = db.query(LedgerEntry)
-    if current_user.role in ("student", "teacher"):
-        query = query.join(
-            StudentWallet, LedgerEntry.wallet_id == StudentWallet.id
-        )
-        if current_user.role == "student":
-            query = query.filter(StudentWallet.student_id == current_user.id)
-        if current_user.role == "teacher":
-            query = query.join(
-                Classroom, StudentWallet.classroom_id == Classroom.id
-            ).filter(Classroom.teacher_id == current_user.id)
+    teacher_index = None
+    if current_user.role == "teacher":
+        teacher_index = get_teacher_index(db, current_user.id)
     if wallet_id is not None:
-        wallet = _get_wallet_or_404(db, wallet_id)
-        _ensure_wallet_access(db, wallet, current_user)
-        query = query.filter(LedgerEntry.wallet_id == wallet_id)
-    if assignment_id is not None:
-        query = query.filter(LedgerEntry.assignment_id == assignment_id)
-    return query.offset(skip).limit(limit).all()
+        authorize_wallet(db, wallet_id, current_user)
+    entry = ledger_source(include_archived)
+    query = _list_statement(entry, current_user, wallet_id, assignment_id, teacher_index)
+    query = paginate(query, entry.id, skip, limit, cursor)
+    return next_page(response, db.scalars(query).all(), limit)
+
+
+async def list_ledger_entries_async(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    wallet_id: int | None = None,
+    assignment_id: int | None = None,
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    teacher_index = None
+    if current_user.role == "teacher":
+        teacher_index = await get_teacher_index_async(db, current_user.id)
+    if wallet_id is not None:
+        await authorize_wallet_async(db, wallet_id, current_user)
+    entry = ledger_source(include_archived)
+    query = _list_statement(entry, current_user, wallet_id, assignment_id, teacher_index)
+    query = paginate(query, entry.id, skip, limit, cursor)
+    return next_page(response, (await db.scalars(query)).all(), limit)
+
+
+router.add_api_route(
+    "",
+    list_ledger_entries_async if settings.db_async_mode else list_ledger_entries,
+    methods=["GET"],
+    response_model=list[LedgerEntryOut],
+    name="list_ledger_entries",
+)
+
+
+@router.get("/summary", response_model=list[LedgerSummaryRow])
+def summarize_ledger_entries(
+    rollup: Literal["wallet", "classroom"] = "wallet",
+    wallet_id: int | None = None,
+    classroom_id: int | None = None,
+    assignment_id: int | None = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    teacher_index = _authorize_filters(db, current_user, wallet_id, classroom_id)
+    key = (current_user.id, rollup, wallet_id, classroom_id, assignment_id, include_archived)
+    rows = summary_cache.get(key)
+    if rows is not None:
+        return rows
+
+    entry = ledger_source(include_archived)
+    group = StudentWallet.classroom_id if rollup == "classroom" else entry.wallet_id
+    columns = (group, entry.entry_type, entry.source, entry.assignment_id)
+    query = select(
+        *columns,
+        func.count(entry.id),
+        func.coalesce(func.sum(entry.amount), 0),
+    )
+    if rollup == "classroom":
+        query = query.join(StudentWallet, entry.wallet_id == StudentWallet.id)
+    query = _scope(
+        query, entry, current_user, wallet_id, assignment_id, teacher_index, classroom_id
+    )
+    rows = [
+        LedgerSummaryRow(
+            wallet_id=group_id if rollup == "wallet" else None,
+            classroom_id=group_id if rollup == "classroom" else None,
+            entry_type=entry_type,
+            source=source,
+            assignment_id=row_assignment_id,
+            entries=entries,
+            total=total,
+        )
+        for group_id, entry_type, source, row_assignment_id, entries, total in db.execute(
+            query.group_by(*columns).order_by(*columns)
+        )
+    ]
+    summary_cache.set(key, rows)
+    return rows
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _export_rows(factory: sessionmaker, query: Select, fmt: str) -> Iterator[str]:
+    """Stream ``query`` in ``yield_per`` batches on a session owned by the generator."""
+    with factory() as db:
+        result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            for batch in result.partitions():
+                writer.writerows(batch)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for batch in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_json_default) + "\n"
+                    for row in batch
+                )
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_ledger_entries(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    wallet_id: int | None = None,
+    classroom_id: int | None = None,
+    assignment_id: int | None = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    teacher_index = _authorize_filters(db, current_user, wallet_id, classroom_id)
+    entry = ledger_source(include_archived)
+    query = _scope(
+        select(*(getattr(entry, column) for column in EXPORT_COLUMNS)),
+        entry,
+        current_user,
+        wallet_id,
+        assignment_id,
+        teacher_index,
+        classroom_id,
+    ).order_by(entry.id)
+    # Dependencies with yield are torn down before the body streams, so the
+    # generator opens its own session.
+    return StreamingResponse(
+        _export_rows(read_sessionmaker(request), query, format),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="ledger-entries.{format}"'
+        },
+    )
 
 
-@router.post("", response_model=LedgerEntryOut, status_code=status.HTTP_201_CREATED)
 def create_ledger_entry(
     payload: LedgerEntryCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
-    wallet = _get_wallet_or_404(db, payload.wallet_id)
-    _ensure_wallet_access(db, wallet, current_user)
+    authorize_wallet(db, payload.wallet_id, current_user)
     entry = LedgerEntry(**payload.model_dump())
     db.add(entry)
+    db.flush()
+    apply_balance_delta(db, entry.wallet_id, signed_amount(entry.entry_type, entry.amount))
     db.commit()
+    invalidate_wallet_dashboards(entry.wallet_id)
     db.refresh(entry)
     return entry
 
 
+async def create_ledger_entry_grouped(
+    payload: LedgerEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
+):
+    await run_in_threadpool(authorize_wallet, db, payload.wallet_id, current_user)
+    values = {**payload.model_dump(), "created_at": utcnow()}
+    entry_id = await asyncio.wrap_future(ledger_committer.submit(values))
+    invalidate_wallet_dashboards(payload.wallet_id)
+    return LedgerEntryOut(id=entry_id, **values)
+
+
+router.add_api_route(
+    "",
+    create_ledger_entry_grouped if settings.ledger_group_commit else create_ledger_entry,
+    methods=["POST"],
+    response_model=LedgerEntryOut,
+    status_code=status.HTTP_201_CREATED,
+    name="create_ledger_entry",
+)
+
+
 @router.get("/{entry_id}", response_model=LedgerEntryOut)
 def get_ledger_entry(
     entry_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    entry = _get_or_404(db, entry_id)
-    wallet = _get_wallet_or_404(db, entry.wallet_id)
-    _ensure_wallet_access(db, wallet, current_user)
+    entry = get_entry_with_access(db, entry_id, current_user)
     return entry
 
 
@@ -99,15 +339,20 @@ def update_ledger_entry(
     entry_id: int,
     payload: LedgerEntryUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
-    entry = _get_or_404(db, entry_id)
-    wallet = _get_wallet_or_404(db, entry.wallet_id)
-    _ensure_wallet_access(db, wallet, current_user)
+    entry = get_entry_with_access(db, entry_id, current_user)
     updates = payload.model_dump(exclude_unset=True)
+    previous = signed_amount(entry.entry_type, entry.amount)
     for key, value in updates.items():
         setattr(entry, key, value)
+    db.flush()
+    delta = signed_amount(entry.entry_type, entry.amount) - previous
+    if delta:
+        invalidate_snapshots(db, entry.wallet_id, entry.created_at)
+    apply_balance_delta(db, entry.wallet_id, delta)
     db.commit()
+    invalidate_wallet_dashboards(entry.wallet_id)
     db.refresh(entry)
     return entry
 
@@ -116,11 +361,13 @@ def update_ledger_entry(
 def delete_ledger_entry(
     entry_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
-    entry = _get_or_404(db, entry_id)
-    wallet = _get_wallet_or_404(db, entry.wallet_id)
-    _ensure_wallet_access(db, wallet, current_user)
+    entry = get_entry_with_access(db, entry_id, current_user)
     db.delete(entry)
+    invalidate_snapshots(db, entry.wallet_id, entry.created_at)
+    db.flush()
+    apply_balance_delta(db, entry.wallet_id, -signed_amount(entry.entry_type, entry.amount))
     db.commit()
+    invalidate_wallet_dashboards(entry.wallet_id)
     return None
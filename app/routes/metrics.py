@@ -0,0 +1,75 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import cache_stats
+from app.core.hashing import password_hasher
+from app.core.metrics import render_samples, request_duration
+from app.db.session import pool_statuses
+from app.group_commit import ledger_committer
+
+router = APIRouter(tags=["metrics"])
+
+POOL_METRICS = {
+    "checked_out": ("checked_out", "gauge", "Connections currently checked out."),
+    "size": ("size", "gauge", "Configured pool size."),
+    "overflow": ("overflow", "gauge", "Connections open beyond the pool size."),
+    "checkouts": ("checkouts", "counter", "Successful connection checkouts."),
+    "timeouts": ("timeouts", "counter", "Checkouts that timed out waiting for a connection."),
+    "wait_seconds": ("wait_seconds_total", "counter", "Total time spent waiting for a connection."),
+}
+
+CACHE_METRICS = {
+    "size": ("size", "gauge", "Entries currently cached."),
+    "hits": ("hits", "counter", "Cache hits."),
+    "misses": ("misses", "counter", "Cache misses."),
+    "evictions": ("evictions", "counter", "Entries evicted to respect the size bound."),
+}
+
+HASHER_METRICS = {
+    "busy": ("busy", "gauge", "Password hashing workers currently busy."),
+    "queued": ("queued", "gauge", "Password hashing jobs waiting for a worker."),
+    "rejected": ("rejected", "counter", "Password hashing jobs rejected with 503."),
+}
+
+GROUP_COMMIT_METRICS = {
+    "batches": ("batches", "counter", "Ledger group-commit transactions."),
+    "entries": ("entries", "counter", "Ledger entries written by group commit."),
+    "failed": ("failed", "counter", "Ledger entries that failed to commit."),
+    "queued": ("queued", "gauge", "Ledger entries waiting for the next group commit."),
+}
+
+
+def _render_group(
+    prefix: str, spec: dict, label: str | None, groups: dict[str, dict]
+) -> list[str]:
+    lines = []
+    for key, (stat_key, kind, documentation) in spec.items():
+        name = f"{prefix}_{key}" + ("_total" if kind == "counter" else "")
+        samples = [
+            ({label: group} if label else {}, stats[stat_key])
+            for group, stats in groups.items()
+            if stat_key in stats
+        ]
+        lines.extend(render_samples(name, kind, documentation, samples))
+    return lines
+
+
+def render_metrics() -> str:
+    lines = list(request_duration.render())
+    lines += _render_group("endowal_db_pool", POOL_METRICS, "pool", pool_statuses())
+    lines += _render_group("endowal_cache", CACHE_METRICS, "cache", cache_stats())
+    lines += _render_group(
+        "endowal_password_hasher", HASHER_METRICS, None, {"": password_hasher.stats()}
+    )
+    lines += _render_group(
+        "endowal_ledger_group_commit",
+        GROUP_COMMIT_METRICS,
+        None,
+        {"": ledger_committer.stats()},
+    )
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,14 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.access import classroom_owners, invalidate_teacher_index
+from app.core.config import settings
+from app.core.hashing import password_hasher
 from app.core.security import get_password_hash
+from app.dashboard import invalidate_dashboard
 from app.db.session import get_db
-from app.deps import get_current_user, require_roles
-from app.models import User
-from app.schemas.user import UserCreate, UserOut, UserUpdate
+from app.deps import (
+    Principal,
+    get_current_user,
+    get_read_db,
+    invalidate_principal,
+    require_roles,
+)
+from app.models import Classroom, Enrollment, User
+from app.pagination import next_page, paginate
+from app.provisioning import provision_wallets
+from app.schemas.user import (
+    UserBulkResult,
+    UserBulkRowResult,
+    UserCreate,
+    UserOut,
+    UserUpdate,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+USER_ROLES = {"teacher", "student", "admin"}
+
+BULK_CREATE_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/UserCreate"}}
+            },
+            "text/csv": {
+                "schema": {"type": "string"},
+                "example": "email,name,role,password\ns1@endowal.app,Jordan Lee,student,Student123!\n",
+            },
+        },
+    }
+}
+
 
 def _get_or_404(db: Session, user_id: int) -> User:
     user = db.get(User, user_id)
@@ -19,26 +62,29 @@ def _get_or_404(db: Session, user_id: int) -> User:
 
 @router.get("", response_model=list[UserOut])
 def list_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     role: str | None = None,
     email: str | None = None,
-    db: Session = Depends(get_db),
-    _: User = Depends(require_roles("admin")),
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(require_roles("admin")),
 ):
     query = db.query(User)
     if role:
         query = query.filter(User.role == role)
     if email:
         query = query.filter(User.email == email)
-    return query.offset(skip).limit(limit).all()
+    query = paginate(query, User.id, skip, limit, cursor)
+    return next_page(response, query.all(), limit)
 
 
 @router.post("", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 def create_user(
     payload: UserCreate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles("admin")),
+    _: Principal = Depends(require_roles("admin")),
 ):
     user = User(
         email=payload.email,
@@ -53,11 +99,144 @@ def create_user(
     return user
 
 
+def _parse_bulk_rows(body: bytes, content_type: str) -> list:
+    if content_type.startswith("text/csv"):
+        try:
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            return [
+                {
+                    key.strip(): value.strip()
+                    for key, value in row.items()
+                    if key and isinstance(value, str) and value.strip()
+                }
+                for row in reader
+            ]
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise HTTPException(status_code=400, detail="Invalid CSV body") from exc
+    try:
+        rows = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of users")
+    return rows
+
+
+def _existing_emails(db: Session, emails: list[str]) -> set[str]:
+    return set(db.scalars(select(User.email).where(User.email.in_(emails))))
+
+
+def _insert_users(
+    db: Session,
+    payloads: list[UserCreate],
+    hashes: list[str],
+    classroom_id: int | None,
+) -> list[int]:
+    try:
+        user_ids = list(
+            db.scalars(
+                insert(User).returning(User.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "email": payload.email,
+                        "name": payload.name,
+                        "role": payload.role,
+                        "is_active": payload.is_active,
+                        "password_hash": password_hash,
+                    }
+                    for payload, password_hash in zip(payloads, hashes)
+                ],
+            )
+        )
+        enrollments = [
+            {"classroom_id": classroom_id, "student_id": user_id, "status": "active"}
+            for payload, user_id in zip(payloads, user_ids)
+            if classroom_id is not None and payload.role == "student"
+        ]
+        owners = []
+        if enrollments:
+            db.execute(insert(Enrollment), enrollments)
+            if settings.provision_wallets_on_enrollment:
+                provision_wallets(
+                    db, classroom_id, [enrollment["student_id"] for enrollment in enrollments]
+                )
+                owners = classroom_owners(db, classroom_id)
+        db.commit()
+        invalidate_teacher_index(*owners)
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Import conflicted with existing data, retry"
+        ) from exc
+    return user_ids
+
+
+@router.post("/bulk", response_model=UserBulkResult, openapi_extra=BULK_CREATE_OPENAPI)
+async def bulk_create_users(
+    request: Request,
+    classroom_id: int | None = None,
+    db: Session = Depends(get_db),
+    _: Principal = Depends(require_roles("admin")),
+):
+    rows = _parse_bulk_rows(await request.body(), request.headers.get("content-type", ""))
+    if len(rows) > settings.user_bulk_max_rows:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.user_bulk_max_rows} users per import",
+        )
+    if classroom_id is not None and not await run_in_threadpool(db.get, Classroom, classroom_id):
+        raise HTTPException(status_code=404, detail="Classroom not found")
+
+    results: list[UserBulkRowResult] = []
+    valid: list[tuple[UserBulkRowResult, UserCreate]] = []
+    seen: set[str] = set()
+    for index, row in enumerate(rows, start=1):
+        email = row.get("email") if isinstance(row, dict) else None
+        result = UserBulkRowResult(
+            row=index, email=email if isinstance(email, str) else None, status="error"
+        )
+        results.append(result)
+        try:
+            payload = UserCreate.model_validate(row)
+        except ValidationError as exc:
+            result.error = "; ".join(
+                f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in exc.errors()
+            )
+            continue
+        if payload.role not in USER_ROLES:
+            result.error = f"Invalid role: {payload.role}"
+        elif payload.email in seen:
+            result.error = "Duplicate email in import"
+        else:
+            seen.add(payload.email)
+            valid.append((result, payload))
+
+    if valid:
+        existing = await run_in_threadpool(_existing_emails, db, list(seen))
+        pending = []
+        for result, payload in valid:
+            if payload.email in existing:
+                result.error = "Email already registered"
+            else:
+                pending.append((result, payload))
+        if pending:
+            payloads = [payload for _, payload in pending]
+            hashes = await password_hasher.hash_many([payload.password for payload in payloads])
+            user_ids = await run_in_threadpool(_insert_users, db, payloads, hashes, classroom_id)
+            for (result, _), user_id in zip(pending, user_ids):
+                result.status = "created"
+                result.user_id = user_id
+            invalidate_dashboard(classroom_id)
+
+    created = sum(1 for result in results if result.status == "created")
+    return UserBulkResult(created=created, failed=len(results) - created, rows=results)
+
+
 @router.get("/{user_id}", response_model=UserOut)
 def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "admin" and current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
@@ -69,7 +248,7 @@ def update_user(
     user_id: int,
     payload: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     user = _get_or_404(db, user_id)
     if current_user.role != "admin" and current_user.id != user_id:
@@ -81,6 +260,7 @@ def update_user(
         setattr(user, key, value)
     db.commit()
     db.refresh(user)
+    invalidate_principal(user_id)
     return user
 
 
@@ -88,9 +268,10 @@ def update_user(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles("admin")),
+    _: Principal = Depends(require_roles("admin")),
 ):
     user = _get_or_404(db, user_id)
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id)
     return None
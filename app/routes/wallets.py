@@ -1,80 +1,135 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.deps import get_current_user, require_roles
-from app.models import Classroom, StudentWallet, User
+from app.access import (
+    TeacherIndex,
+    classroom_owners,
+    ensure_classroom_access,
+    ensure_classroom_access_async,
+    ensure_wallet_access,
+    get_teacher_index,
+    get_teacher_index_async,
+    invalidate_teacher_index,
+)
+from app.allocation import reallocate_buckets
+from app.balances import balance_as_of
+from app.core.config import settings
+from app.dashboard import invalidate_dashboard
+from app.db.session import get_async_db, get_db
+from app.deps import (
+    Principal,
+    get_current_user,
+    get_current_user_async,
+    get_read_db,
+    require_roles,
+)
+from app.models import StudentWallet
+from app.pagination import next_page, paginate
+from app.models.ledger import utcnow
 from app.schemas.wallet import (
     StudentWalletCreate,
     StudentWalletOut,
     StudentWalletUpdate,
+    WalletBalanceAsOf,
 )
 
 router = APIRouter(prefix="/wallets", tags=["wallets"])
 
 
-def _get_or_404(db: Session, wallet_id: int) -> StudentWallet:
-    wallet = db.get(StudentWallet, wallet_id)
-    if not wallet:
-        raise HTTPException(status_code=404, detail="Wallet not found")
-    return wallet
-
-
-def _ensure_classroom_access(db: Session, classroom_id: int, current_user: User) -> None:
-    classroom = db.get(Classroom, classroom_id)
-    if not classroom:
-        raise HTTPException(status_code=404, detail="Classroom not found")
-    if current_user.role == "teacher" and classroom.teacher_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def _list_statement(
+    current_user: Principal,
+    classroom_id: int | None,
+    student_id: int | None,
+    teacher_index: TeacherIndex | None = None,
+) -> Select:
+    query = select(StudentWallet)
+    if current_user.role == "student":
+        if student_id is not None and student_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        student_id = current_user.id
+    if teacher_index is not None and classroom_id is None:
+        query = query.where(StudentWallet.classroom_id.in_(sorted(teacher_index.classroom_ids)))
+    if classroom_id is not None:
+        query = query.where(StudentWallet.classroom_id == classroom_id)
+    if student_id is not None:
+        query = query.where(StudentWallet.student_id == student_id)
+    return query
 
 
-def _ensure_wallet_access(db: Session, wallet: StudentWallet, current_user: User) -> None:
-    if current_user.role == "student" and wallet.student_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+def list_wallets(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    classroom_id: int | None = None,
+    student_id: int | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    teacher_index = None
     if current_user.role == "teacher":
-        _ensure_classroom_access(db, wallet.classroom_id, current_user)
+        teacher_index = get_teacher_index(db, current_user.id)
+        if classroom_id is not None:
+            ensure_classroom_access(db, classroom_id, current_user)
+    query = _list_statement(current_user, classroom_id, student_id, teacher_index)
+    query = paginate(query, StudentWallet.id, skip, limit, cursor)
+    return next_page(response, db.scalars(query).all(), limit)
 
 
-@router.get("", response_model=list[StudentWalletOut])
-def list_wallets(
+async def list_wallets_async(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     classroom_id: int | None = None,
     student_id: int | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async),
 ):
-    query = db.query(StudentWallet)
-    if current_user.role == "student":
-        if student_id is not None and student_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-        student_id = current_user.id
+    teacher_index = None
     if current_user.role == "teacher":
+        teacher_index = await get_teacher_index_async(db, current_user.id)
         if classroom_id is not None:
-            _ensure_classroom_access(db, classroom_id, current_user)
-            query = query.filter(StudentWallet.classroom_id == classroom_id)
-        else:
-            query = query.join(
-                Classroom, StudentWallet.classroom_id == Classroom.id
-            ).filter(Classroom.teacher_id == current_user.id)
-    if classroom_id is not None:
-        query = query.filter(StudentWallet.classroom_id == classroom_id)
-    if student_id is not None:
-        query = query.filter(StudentWallet.student_id == student_id)
-    return query.offset(skip).limit(limit).all()
+            await ensure_classroom_access_async(db, classroom_id, current_user)
+    query = _list_statement(current_user, classroom_id, student_id, teacher_index)
+    query = paginate(query, StudentWallet.id, skip, limit, cursor)
+    return next_page(response, (await db.scalars(query)).all(), limit)
+
+
+router.add_api_route(
+    "",
+    list_wallets_async if settings.db_async_mode else list_wallets,
+    methods=["GET"],
+    response_model=list[StudentWalletOut],
+    name="list_wallets",
+)
 
 
 @router.post("", response_model=StudentWalletOut, status_code=status.HTTP_201_CREATED)
 def create_wallet(
     payload: StudentWalletCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
     if current_user.role == "teacher":
-        _ensure_classroom_access(db, payload.classroom_id, current_user)
+        ensure_classroom_access(db, payload.classroom_id, current_user)
     wallet = StudentWallet(**payload.model_dump())
     db.add(wallet)
-    db.commit()
+    owners = classroom_owners(db, wallet.classroom_id)
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Student already has a wallet in this classroom"
+        ) from exc
+    invalidate_teacher_index(*owners)
+    invalidate_dashboard(wallet.classroom_id)
     db.refresh(wallet)
     return wallet
 
@@ -82,27 +137,54 @@ def create_wallet(
 @router.get("/{wallet_id}", response_model=StudentWalletOut)
 def get_wallet(
     wallet_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    wallet = _get_or_404(db, wallet_id)
-    _ensure_wallet_access(db, wallet, current_user)
+    wallet = ensure_wallet_access(db, wallet_id, current_user)
     return wallet
 
 
+@router.get("/{wallet_id}/balance", response_model=WalletBalanceAsOf)
+def get_wallet_balance_as_of(
+    wallet_id: int,
+    as_of: datetime | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    ensure_wallet_access(db, wallet_id, current_user)
+    if as_of is None:
+        as_of = utcnow()
+    elif as_of.tzinfo is not None:
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    balance, snapshot_as_of = balance_as_of(db, wallet_id, as_of)
+    return WalletBalanceAsOf(
+        wallet_id=wallet_id, as_of=as_of, balance=balance, snapshot_as_of=snapshot_as_of
+    )
+
+
 @router.patch("/{wallet_id}", response_model=StudentWalletOut)
 def update_wallet(
     wallet_id: int,
     payload: StudentWalletUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
-    wallet = _get_or_404(db, wallet_id)
-    _ensure_wallet_access(db, wallet, current_user)
+    wallet = ensure_wallet_access(db, wallet_id, current_user)
     updates = payload.model_dump(exclude_unset=True)
+    previous_classroom_id = wallet.classroom_id
+    owners = []
+    if "classroom_id" in updates and updates["classroom_id"] != wallet.classroom_id:
+        if current_user.role == "teacher":
+            ensure_classroom_access(db, updates["classroom_id"], current_user)
+        owners = classroom_owners(db, wallet.classroom_id, updates["classroom_id"])
     for key, value in updates.items():
         setattr(wallet, key, value)
+    if "balance" in updates:
+        db.flush()
+        reallocate_buckets(db, wallet_id=wallet.id)
     db.commit()
+    invalidate_teacher_index(*owners)
+    invalidate_dashboard(previous_classroom_id, wallet.classroom_id)
     db.refresh(wallet)
     return wallet
 
@@ -111,10 +193,13 @@ def update_wallet(
 def delete_wallet(
     wallet_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles("teacher", "admin")),
+    current_user: Principal = Depends(require_roles("teacher", "admin")),
 ):
-    wallet = _get_or_404(db, wallet_id)
-    _ensure_wallet_access(db, wallet, current_user)
+    wallet = ensure_wallet_access(db, wallet_id, current_user)
+    owners = classroom_owners(db, wallet.classroom_id)
+    classroom_id = wallet.classroom_id
     db.delete(wallet)
     db.commit()
+    invalidate_teacher_index(*owners)
+    invalidate_dashboard(classroom_id)
     return None
@@ -1,20 +1,54 @@
 from app.schemas.assignment import AssignmentCreate, AssignmentOut, AssignmentUpdate
+from app.schemas.auth import LoginRequest, Token
 from app.schemas.budget import (
     BudgetLineItemCreate,
+    BudgetLineItemDraft,
     BudgetLineItemOut,
     BudgetLineItemUpdate,
     BudgetSubmissionCreate,
+    BudgetSubmissionItemsReplace,
     BudgetSubmissionOut,
     BudgetSubmissionUpdate,
+    BudgetSubmissionWithItemsCreate,
+    BudgetSubmissionWithItemsOut,
+)
+from app.schemas.classroom import (
+    ClassroomCreate,
+    ClassroomDashboard,
+    ClassroomOut,
+    ClassroomUpdate,
+    DashboardStudent,
+    DashboardWallet,
+    WalletActivity,
+)
+from app.schemas.enrollment import (
+    EnrollmentBulkCreate,
+    EnrollmentBulkResult,
+    EnrollmentCreate,
+    EnrollmentOut,
+    EnrollmentUpdate,
+)
+from app.schemas.ledger import (
+    ClassroomGrantCreate,
+    ClassroomGrantResult,
+    LedgerEntryCreate,
+    LedgerEntryOut,
+    LedgerEntryUpdate,
+    LedgerSummaryRow,
+)
+from app.schemas.user import (
+    UserBulkResult,
+    UserBulkRowResult,
+    UserCreate,
+    UserOut,
+    UserUpdate,
 )
-from app.schemas.classroom import ClassroomCreate, ClassroomOut, ClassroomUpdate
-from app.schemas.enrollment import EnrollmentCreate, EnrollmentOut, EnrollmentUpdate
-from app.schemas.ledger import LedgerEntryCreate, LedgerEntryOut, LedgerEntryUpdate
-from app.schemas.user import UserCreate, UserOut, UserUpdate
 from app.schemas.wallet import (
+    BucketReallocationResult,
     StudentWalletCreate,
     StudentWalletOut,
     StudentWalletUpdate,
+    WalletBalanceAsOf,
     WalletBucketCreate,
     WalletBucketOut,
     WalletBucketUpdate,
@@ -24,31 +58,47 @@ __all__ = [
     "AssignmentCreate",
     "AssignmentOut",
     "AssignmentUpdate",
+    "BucketReallocationResult",
     "BudgetLineItemCreate",
+    "BudgetLineItemDraft",
     "BudgetLineItemOut",
     "BudgetLineItemUpdate",
     "BudgetSubmissionCreate",
+    "BudgetSubmissionItemsReplace",
     "BudgetSubmissionOut",
     "BudgetSubmissionUpdate",
+    "BudgetSubmissionWithItemsCreate",
+    "BudgetSubmissionWithItemsOut",
     "ClassroomCreate",
+    "ClassroomDashboard",
+    "ClassroomGrantCreate",
+    "ClassroomGrantResult",
     "ClassroomOut",
     "ClassroomUpdate",
+    "DashboardStudent",
+    "DashboardWallet",
+    "EnrollmentBulkCreate",
+    "EnrollmentBulkResult",
     "EnrollmentCreate",
     "EnrollmentOut",
     "EnrollmentUpdate",
     "LedgerEntryCreate",
     "LedgerEntryOut",
     "LedgerEntryUpdate",
+    "LedgerSummaryRow",
+    "LoginRequest",
     "StudentWalletCreate",
     "StudentWalletOut",
     "StudentWalletUpdate",
+    "Token",
+    "UserBulkResult",
+    "UserBulkRowResult",
     "UserCreate",
     "UserOut",
     "UserUpdate",
+    "WalletActivity",
+    "WalletBalanceAsOf",
     "WalletBucketCreate",
     "WalletBucketOut",
     "WalletBucketUpdate",
 ]
-from app.schemas.auth import LoginRequest, Token
-    "LoginRequest",
-    "Token",
@@ -100,3 +100,77 @@ class BudgetLineItemOut(BudgetLineItemBase):
     )
 
     id: int
+
+
+class BudgetLineItemDraft(BaseModel):
+    category: str
+    amount: float
+
+
+class BudgetSubmissionWithItemsCreate(BudgetSubmissionBase):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "assignment_id": 4,
+                    "student_id": 7,
+                    "notes": "Keeping costs lean.",
+                    "status": "submitted",
+                    "line_items": [
+                        {"category": "Supplies", "amount": 45.0},
+                        {"category": "Snacks", "amount": 25.0},
+                        {"category": "Savings", "amount": 50.0},
+                    ],
+                }
+            ]
+        }
+    )
+
+    # Computed from the line items; a total that is sent must match them.
+    total_planned: float | None = None
+    line_items: list[BudgetLineItemDraft]
+
+
+class BudgetSubmissionItemsReplace(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "notes": "Moved snack money to savings.",
+                    "line_items": [
+                        {"category": "Supplies", "amount": 45.0},
+                        {"category": "Savings", "amount": 75.0},
+                    ],
+                }
+            ]
+        }
+    )
+
+    notes: str | None = None
+    status: str | None = None
+    line_items: list[BudgetLineItemDraft]
+
+
+class BudgetSubmissionWithItemsOut(BudgetSubmissionOut):
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "examples": [
+                {
+                    "id": 6,
+                    "assignment_id": 4,
+                    "student_id": 7,
+                    "total_planned": 120.0,
+                    "notes": "Keeping costs lean.",
+                    "status": "submitted",
+                    "line_items": [
+                        {"id": 11, "submission_id": 6, "category": "Supplies", "amount": 45.0},
+                        {"id": 12, "submission_id": 6, "category": "Snacks", "amount": 25.0},
+                        {"id": 13, "submission_id": 6, "category": "Savings", "amount": 50.0},
+                    ],
+                }
+            ]
+        },
+    )
+
+    line_items: list[BudgetLineItemOut]
@@ -1,5 +1,9 @@
+import datetime as dt
+
 from pydantic import BaseModel, ConfigDict
 
+from app.schemas.wallet import StudentWalletOut, WalletBucketOut
+
 
 class ClassroomBase(BaseModel):
     model_config = ConfigDict(
@@ -57,3 +61,75 @@ class ClassroomOut(ClassroomBase):
     )
 
     id: int
+
+
+class WalletActivity(BaseModel):
+    entries: int = 0
+    deposits: float = 0
+    withdrawals: float = 0
+    last_entry_at: dt.datetime | None = None
+
+
+class DashboardWallet(StudentWalletOut):
+    buckets: list[WalletBucketOut] = []
+    activity: WalletActivity = WalletActivity()
+
+
+class DashboardStudent(BaseModel):
+    id: int
+    name: str | None = None
+    email: str
+    enrollment_status: str | None = None
+    wallet: DashboardWallet | None = None
+
+
+class ClassroomDashboard(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "classroom": {
+                        "id": 1,
+                        "teacher_id": 2,
+                        "name": "Personal Finance 101",
+                        "school_name": "Endowal Academy",
+                        "grade_level": "8th",
+                    },
+                    "activity_since": "2026-10-11T00:00:00",
+                    "students": [
+                        {
+                            "id": 7,
+                            "name": "Taylor Kim",
+                            "email": "taylor@endowal.app",
+                            "enrollment_status": "active",
+                            "wallet": {
+                                "id": 9,
+                                "classroom_id": 1,
+                                "student_id": 7,
+                                "balance": 125.0,
+                                "buckets": [
+                                    {
+                                        "id": 3,
+                                        "wallet_id": 9,
+                                        "name": "Giving",
+                                        "percent_target": 10.0,
+                                        "balance": 12.5,
+                                    }
+                                ],
+                                "activity": {
+                                    "entries": 4,
+                                    "deposits": 60.0,
+                                    "withdrawals": 12.0,
+                                    "last_entry_at": "2026-10-17T14:05:00",
+                                },
+                            },
+                        }
+                    ],
+                }
+            ]
+        }
+    )
+
+    classroom: ClassroomOut
+    activity_since: dt.datetime
+    students: list[DashboardStudent]
@@ -43,3 +43,37 @@ class EnrollmentOut(EnrollmentBase):
     )
 
     id: int
+
+
+class EnrollmentBulkCreate(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{"classroom_id": 1, "student_ids": [7, 8, 9], "status": "active"}]
+        }
+    )
+
+    classroom_id: int
+    student_ids: list[int]
+    status: str = "active"
+
+
+class EnrollmentBulkResult(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "classroom_id": 1,
+                    "enrollments": [
+                        {"id": 3, "classroom_id": 1, "student_id": 7, "status": "active"}
+                    ],
+                    "already_enrolled": [8],
+                    "wallet_ids": [9],
+                }
+            ]
+        }
+    )
+
+    classroom_id: int
+    enrollments: list[EnrollmentOut]
+    already_enrolled: list[int]
+    wallet_ids: list[int]
@@ -1,3 +1,5 @@
+import datetime as dt
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -54,9 +56,74 @@ class LedgerEntryOut(LedgerEntryBase):
                     "entry_type": "deposit",
                     "source": "teacher_grant",
                     "memo": "Weekly savings bonus",
+                    "created_at": "2026-03-02T15:04:05",
                 }
             ]
         },
     )
 
     id: int
+    created_at: dt.datetime | None = None
+
+
+class ClassroomGrantCreate(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "amount": 10.0,
+                    "entry_type": "deposit",
+                    "assignment_id": 4,
+                    "memo": "Weekly allowance",
+                    "student_ids": [7, 8, 9],
+                }
+            ]
+        }
+    )
+
+    amount: float
+    entry_type: str = "deposit"
+    assignment_id: int | None = None
+    memo: str | None = None
+    student_ids: list[int] | None = None
+
+
+class ClassroomGrantResult(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {"classroom_id": 1, "posted": 3, "wallet_ids": [9, 10, 11], "entry_ids": [40, 41, 42]}
+            ]
+        }
+    )
+
+    classroom_id: int
+    posted: int
+    wallet_ids: list[int]
+    entry_ids: list[int]
+
+
+class LedgerSummaryRow(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "wallet_id": 9,
+                    "classroom_id": None,
+                    "entry_type": "deposit",
+                    "source": "teacher_grant",
+                    "assignment_id": 4,
+                    "entries": 12,
+                    "total": 300.0,
+                }
+            ]
+        }
+    )
+
+    wallet_id: int | None = None
+    classroom_id: int | None = None
+    entry_type: str
+    source: str
+    assignment_id: int | None = None
+    entries: int
+    total: float
@@ -71,3 +71,37 @@ class UserOut(UserBase):
     )
 
     id: int
+
+
+class UserBulkRowResult(BaseModel):
+    row: int
+    email: str | None = None
+    status: str
+    user_id: int | None = None
+    error: str | None = None
+
+
+class UserBulkResult(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "created": 1,
+                    "failed": 1,
+                    "rows": [
+                        {"row": 1, "email": "s1@endowal.app", "status": "created", "user_id": 21},
+                        {
+                            "row": 2,
+                            "email": "teacher@endowal.app",
+                            "status": "error",
+                            "error": "Email already registered",
+                        },
+                    ],
+                }
+            ]
+        }
+    )
+
+    created: int
+    failed: int
+    rows: list[UserBulkRowResult]
@@ -1,3 +1,5 @@
+import datetime as dt
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -84,9 +86,40 @@ class WalletBucketOut(WalletBucketBase):
                     "wallet_id": 9,
                     "name": "Giving",
                     "percent_target": 10.0,
+                    "balance": 12.5,
                 }
             ]
         },
     )
 
     id: int
+    balance: float = 0
+
+
+class WalletBalanceAsOf(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "wallet_id": 9,
+                    "as_of": "2026-03-31T23:59:59",
+                    "balance": 118.5,
+                    "snapshot_as_of": "2026-03-31T00:00:00",
+                }
+            ]
+        }
+    )
+
+    wallet_id: int
+    as_of: dt.datetime
+    balance: float
+    snapshot_as_of: dt.datetime | None = None
+
+
+class BucketReallocationResult(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={"examples": [{"classroom_id": 1, "buckets": 84}]}
+    )
+
+    classroom_id: int
+    buckets: int
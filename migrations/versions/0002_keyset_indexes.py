@@ -0,0 +1,37 @@
+"""composite indexes for keyset pagination
+
+Revision ID: 0002_keyset_indexes
+Revises: 0001_initial
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0002_keyset_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+# (table, filter column) pairs whose single-column index is replaced by (column, id)
+KEYSET_INDEXES = [
+    ("ledger_entries", "wallet_id"),
+    ("student_wallets", "classroom_id"),
+    ("student_wallets", "student_id"),
+    ("budget_submissions", "assignment_id"),
+    ("budget_submissions", "student_id"),
+]
+
+
+def upgrade() -> None:
+    for table, column in KEYSET_INDEXES:
+        op.create_index(f"ix_{table}_{column}_id", table, [column, "id"])
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
+    op.create_index("ix_users_role_id", "users", ["role", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_role_id", table_name="users")
+    for table, column in reversed(KEYSET_INDEXES):
+        op.create_index(f"ix_{table}_{column}", table, [column])
+        op.drop_index(f"ix_{table}_{column}_id", table_name=table)
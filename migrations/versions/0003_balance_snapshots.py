@@ -0,0 +1,46 @@
+"""ledger timestamps and wallet balance snapshots
+
+Revision ID: 0003_balance_snapshots
+Revises: 0002_keyset_indexes
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_balance_snapshots"
+down_revision = "0002_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ledger_entries", sa.Column("created_at", sa.DateTime(), nullable=True))
+    op.execute(sa.text("UPDATE ledger_entries SET created_at = CURRENT_TIMESTAMP"))
+    with op.batch_alter_table("ledger_entries") as batch_op:
+        batch_op.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        )
+    op.create_index(
+        "ix_ledger_entries_wallet_id_created_at", "ledger_entries", ["wallet_id", "created_at"]
+    )
+
+    op.create_table(
+        "wallet_balance_snapshots",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("wallet_id", sa.Integer(), nullable=False),
+        sa.Column("as_of", sa.DateTime(), nullable=False),
+        sa.Column("balance", sa.Numeric(12, 2), nullable=False),
+        sa.UniqueConstraint("wallet_id", "as_of", name="uq_snapshot_wallet_as_of"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("wallet_balance_snapshots")
+    op.drop_index("ix_ledger_entries_wallet_id_created_at", table_name="ledger_entries")
+    with op.batch_alter_table("ledger_entries") as batch_op:
+        batch_op.drop_column("created_at")
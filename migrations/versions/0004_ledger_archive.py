@@ -0,0 +1,54 @@
+"""ledger entries archive table
+
+Revision ID: 0004_ledger_archive
+Revises: 0003_balance_snapshots
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0004_ledger_archive"
+down_revision = "0003_balance_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def _existing_enum(*values: str, name: str) -> sa.Enum:
+    # The types already exist from 0001_initial; don't CREATE TYPE them again on Postgres.
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ledger_entries_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("wallet_id", sa.Integer(), nullable=False),
+        sa.Column("assignment_id", sa.Integer(), nullable=True, index=True),
+        sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("entry_type", _existing_enum("deposit", "withdrawal", name="ledger_entry_type"), nullable=False),
+        sa.Column(
+            "source",
+            _existing_enum("teacher_grant", "student_action", name="ledger_entry_source"),
+            nullable=False,
+        ),
+        sa.Column("memo", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("archived_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_ledger_entries_archive_wallet_id_id", "ledger_entries_archive", ["wallet_id", "id"]
+    )
+    op.create_index(
+        "ix_ledger_entries_archive_wallet_id_created_at",
+        "ledger_entries_archive",
+        ["wallet_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ledger_entries_archive")
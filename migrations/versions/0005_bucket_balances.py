@@ -0,0 +1,28 @@
+"""wallet bucket running balances
+
+Revision ID: 0005_bucket_balances
+Revises: 0004_ledger_archive
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_bucket_balances"
+down_revision = "0004_ledger_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing buckets start at zero; run scripts/reallocate_buckets.py to fill them.
+    op.add_column(
+        "wallet_buckets",
+        sa.Column("balance", sa.Numeric(12, 2), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("wallet_buckets") as batch_op:
+        batch_op.drop_column("balance")
@@ -0,0 +1,44 @@
+"""never reuse ledger entry ids on SQLite
+
+Revision ID: 0006_ledger_autoincrement
+Revises: 0005_bucket_balances
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_ledger_autoincrement"
+down_revision = "0005_bucket_balances"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A plain INTEGER PRIMARY KEY reuses max(rowid) + 1, which collides with
+    # archived ids once the newest entries are archived. Postgres sequences
+    # never go backwards, so only SQLite needs the rebuild.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "ledger_entries", recreate="always", table_kwargs={"sqlite_autoincrement": True}
+    ):
+        pass
+    op.execute(sa.text("DELETE FROM sqlite_sequence WHERE name = 'ledger_entries'"))
+    op.execute(
+        sa.text(
+            "INSERT INTO sqlite_sequence (name, seq) "
+            "SELECT 'ledger_entries', COALESCE(MAX(id), 0) FROM "
+            "(SELECT id FROM ledger_entries UNION ALL SELECT id FROM ledger_entries_archive)"
+        )
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "ledger_entries", recreate="always", table_kwargs={"sqlite_autoincrement": False}
+    ):
+        pass
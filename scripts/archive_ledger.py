@@ -0,0 +1,29 @@
+import argparse
+from datetime import datetime
+
+from app.archive import archive_ledger_entries
+from app.db.session import SessionLocal
+
+
+def run(classroom_id: int | None, before: datetime | None, batch_size: int) -> None:
+    with SessionLocal() as db:
+        moved = archive_ledger_entries(db, classroom_id, before, batch_size)
+    print(f"archived {moved} ledger entries")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move ledger entries of an archived classroom or a closed term to ledger_entries_archive."
+    )
+    parser.add_argument("--classroom-id", type=int, default=None)
+    parser.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Archive entries created before this UTC timestamp (end of the closed term).",
+    )
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    if args.classroom_id is None and args.before is None:
+        parser.error("pass --classroom-id and/or --before")
+    run(args.classroom_id, args.before, args.batch_size)
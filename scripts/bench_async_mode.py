@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from scripts.seed_demo import seed
+
+ENDPOINTS = ["/wallets", "/ledger-entries"]
+
+
+async def wait_for_server(client: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+async def run_load(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await wait_for_server(client)
+        login = await client.post(
+            "/auth/login",
+            json={
+                "email": os.getenv("ENDOWAL_TEACHER_EMAIL", "teacher@endowal.app"),
+                "password": os.getenv("ENDOWAL_TEACHER_PASSWORD", "Teacher123!"),
+            },
+        )
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def bench(concurrency: int, duration: float, port: int) -> None:
+    seed(reset=True)
+    base_url = f"http://127.0.0.1:{port}"
+    for mode in ("sync", "async"):
+        env = {**os.environ, "DB_ASYNC_MODE": "true" if mode == "async" else "false"}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env=env,
+        )
+        try:
+            for path in ENDPOINTS:
+                result = asyncio.run(run_load(base_url, path, concurrency, duration))
+                print(
+                    f"{mode:<5} {path:<16} {result['rps']:8.1f} req/s  "
+                    f"p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  "
+                    f"errors {result['errors']}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync and async DB modes on list endpoints.")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    bench(args.concurrency, args.duration, args.port)
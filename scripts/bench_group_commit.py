@@ -0,0 +1,107 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.balances import apply_balance_delta, signed_amount
+from app.db.base import Base
+from app.db.sqlite import configure_sqlite, sqlite_pragmas
+from app.group_commit import LedgerGroupCommitter
+from app.models import LedgerEntry, StudentWallet
+
+
+def make_factory(database_url: str | None, synchronous: str, wallets: int) -> sessionmaker:
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(database_url, pool_size=64, max_overflow=0)
+    configure_sqlite(engine, {**sqlite_pragmas(), "synchronous": synchronous})
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(StudentWallet),
+            [{"classroom_id": 1, "student_id": i, "balance": 0} for i in range(wallets)],
+        )
+    return sessionmaker(bind=engine)
+
+
+def entry(i: int, wallet_ids: list[int]) -> dict:
+    return {
+        "wallet_id": wallet_ids[i % len(wallet_ids)],
+        "amount": 1,
+        "entry_type": "withdrawal",
+        "source": "student_action",
+    }
+
+
+def per_request(factory: sessionmaker, values: dict) -> None:
+    with factory() as db:
+        row = LedgerEntry(**values)
+        db.add(row)
+        db.flush()
+        apply_balance_delta(db, row.wallet_id, signed_amount(row.entry_type, row.amount))
+        db.commit()
+
+
+def run(label: str, submit, wallet_ids: list[int], clients: int, duration: float) -> None:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset: int) -> None:
+        i = offset
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            submit(entry(i, wallet_ids))
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+            i += clients
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{label:<16} {len(latencies) / duration:9.1f} entries/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+
+def bench(
+    clients: int,
+    duration: float,
+    max_batch: int,
+    max_delay_ms: float,
+    synchronous: str,
+    database_url: str | None,
+) -> None:
+    wallets = 200
+    for label in ("per-request", "group commit"):
+        factory = make_factory(database_url, synchronous, wallets)
+        with factory() as db:
+            wallet_ids = list(db.scalars(select(StudentWallet.id)))
+        if label == "per-request":
+            run(label, lambda values: per_request(factory, values), wallet_ids, clients, duration)
+        else:
+            committer = LedgerGroupCommitter(factory, max_batch, max_delay_ms / 1000)
+            run(label, lambda values: committer.submit(values).result(), wallet_ids, clients, duration)
+            committer.shutdown()
+            stats = committer.stats()
+            print(f"{'':<16} mean batch {stats['mean_batch']}  largest {stats['largest_batch']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-request commit vs group commit for ledger appends.")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    parser.add_argument("--synchronous", default="FULL", help="SQLite synchronous pragma (FULL fsyncs every commit).")
+    parser.add_argument("--database-url", default=None, help="Defaults to a throwaway SQLite file.")
+    args = parser.parse_args()
+    bench(args.clients, args.duration, args.max_batch, args.max_delay_ms, args.synchronous, args.database_url)
@@ -0,0 +1,59 @@
+import argparse
+import os
+import subprocess
+import sys
+import timeit
+
+from app.core.metrics import Histogram
+
+REQUEST_LOOP = """
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+for _ in range(200):
+    client.get("/health")
+started = time.perf_counter()
+for _ in range({requests}):
+    client.get("/health")
+print((time.perf_counter() - started) / {requests} * 1_000_000)
+"""
+
+
+def per_request_us(metrics_enabled: bool, requests: int) -> float:
+    env = {
+        **os.environ,
+        "METRICS_ENABLED": str(metrics_enabled).lower(),
+        "SQL_INSTRUMENTATION": "false",
+    }
+    output = subprocess.check_output(
+        [sys.executable, "-c", REQUEST_LOOP.format(requests=requests)], env=env, text=True
+    )
+    return float(output.strip().splitlines()[-1])
+
+
+def bench(requests: int) -> None:
+    histogram = Histogram("bench_seconds", "bench", ("method", "route", "status"))
+    iterations = 200_000
+    seconds = min(
+        timeit.repeat(
+            lambda: histogram.observe(0.012, "GET", "/wallets", "2xx"),
+            number=iterations,
+            repeat=5,
+        )
+    )
+    print(f"Histogram.observe          {seconds / iterations * 1_000_000:8.2f} us")
+
+    baseline = per_request_us(False, requests)
+    instrumented = per_request_us(True, requests)
+    print(f"GET /health without metrics {baseline:8.1f} us/request")
+    print(f"GET /health with metrics    {instrumented:8.1f} us/request")
+    print(f"middleware overhead         {instrumented - baseline:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure /metrics middleware overhead.")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    bench(args.requests)
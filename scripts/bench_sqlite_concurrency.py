@@ -0,0 +1,82 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.db.base import Base
+from app.db.sqlite import configure_sqlite
+from app.models import LedgerEntry
+
+
+def run_profile(tuned: bool, writers: int, readers: int, duration: float) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", pool_size=writers + readers)
+    if tuned:
+        configure_sqlite(engine)
+    Base.metadata.create_all(engine)
+
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def bump(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def writer(wallet_id: int) -> None:
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        insert(LedgerEntry).values(
+                            wallet_id=wallet_id,
+                            amount=5,
+                            entry_type="deposit",
+                            source="teacher_grant",
+                        )
+                    )
+                bump("writes")
+            except OperationalError:
+                bump("locked")
+
+    def reader(wallet_id: int) -> None:
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        select(func.count()).where(LedgerEntry.wallet_id == wallet_id)
+                    ).scalar()
+                bump("reads")
+            except OperationalError:
+                bump("locked")
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {key: value / duration for key, value in counts.items()}
+
+
+def bench(writers: int, readers: int, duration: float) -> None:
+    for label, tuned in (("default", False), ("tuned", True)):
+        result = run_profile(tuned, writers, readers, duration)
+        print(
+            f"{label:<8} writes {result['writes']:8.1f}/s  reads {result['reads']:8.1f}/s  "
+            f"locked errors {result['locked']:6.1f}/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite read/write concurrency benchmark.")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    bench(args.writers, args.readers, args.duration)
@@ -0,0 +1,33 @@
+import argparse
+import timeit
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_access_token, token_cache
+
+
+def uncached(token: str) -> dict:
+    return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+
+
+def bench(iterations: int) -> None:
+    token = create_access_token({"sub": "42", "role": "student"})
+    token_cache.clear()
+    decode_access_token(token)
+
+    results = {}
+    for label, fn in [("jwt.decode", uncached), ("decode_access_token (warm)", decode_access_token)]:
+        seconds = min(timeit.repeat(lambda: fn(token), number=iterations, repeat=5))
+        results[label] = seconds / iterations * 1_000_000
+        print(f"{label:<28} {results[label]:8.2f} us/call")
+
+    saved = results["jwt.decode"] - results["decode_access_token (warm)"]
+    print(f"{'saved per request':<28} {saved:8.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare cached vs uncached JWT verification.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    bench(args.iterations)
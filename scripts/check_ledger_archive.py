@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import tempfile
+
+
+def run(database_url: str | None) -> bool:
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'archive.db')}"
+    os.environ["DATABASE_URL"] = database_url
+
+    from sqlalchemy import select
+
+    from app.archive import archive_ledger_entries, ledger_source
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.models import Classroom, LedgerEntry, StudentWallet
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        classroom = Classroom(teacher_id=0, name="Archive check")
+        db.add(classroom)
+        db.flush()
+        wallet = StudentWallet(classroom_id=classroom.id, student_id=0, balance=0)
+        db.add(wallet)
+        db.commit()
+
+        def post(count: int) -> list[int]:
+            entries = [
+                LedgerEntry(wallet_id=wallet.id, amount=1, entry_type="deposit", source="teacher_grant")
+                for _ in range(count)
+            ]
+            db.add_all(entries)
+            db.commit()
+            return [entry.id for entry in entries]
+
+        # Archive the newest entries, post again, then archive a second time.
+        first = post(3)
+        moved = archive_ledger_entries(db, classroom_id=classroom.id)
+        second = post(1)
+        moved += archive_ledger_entries(db, classroom_id=classroom.id)
+        entry = ledger_source(include_archived=True)
+        ids = list(
+            db.scalars(select(entry.id).where(entry.wallet_id == wallet.id).order_by(entry.id))
+        )
+
+    print(f"first ids {first}  second ids {second}  archived {moved}  all ids {ids}")
+    ok = (
+        min(second) > max(first)
+        and set(first + second) <= set(ids)
+        and len(ids) == len(set(ids))
+    )
+    print("OK" if ok else "ID REUSE: hot entries collided with archived ids")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Archive the newest ledger entries twice and check hot and archived ids never collide."
+    )
+    parser.add_argument("--database-url", default=None, help="Defaults to a throwaway SQLite file.")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.database_url) else 1)
@@ -0,0 +1,83 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+
+def run(posts: int, workers: int, database_url: str | None) -> bool:
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'ledger.db')}"
+    os.environ["DATABASE_URL"] = database_url
+
+    from fastapi.testclient import TestClient
+
+    from app.core.security import create_access_token, get_password_hash
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models import Classroom, LedgerEntry, StudentWallet, User
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        password_hash = get_password_hash("bench")
+        teacher = User(email=f"teacher-{time.time_ns()}@bench.local", password_hash=password_hash, role="teacher")
+        student = User(email=f"student-{time.time_ns()}@bench.local", password_hash=password_hash, role="student")
+        db.add_all([teacher, student])
+        db.flush()
+        classroom = Classroom(teacher_id=teacher.id, name="Concurrency")
+        db.add(classroom)
+        db.flush()
+        wallet = StudentWallet(classroom_id=classroom.id, student_id=student.id, balance=0)
+        db.add(wallet)
+        db.commit()
+        wallet_id = wallet.id
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(teacher.id)})}"}
+
+    client = TestClient(app)
+
+    def post(index: int) -> int:
+        entry_type = "withdrawal" if index % 4 == 0 else "deposit"
+        response = client.post(
+            "/ledger-entries",
+            json={
+                "wallet_id": wallet_id,
+                "amount": 1.25,
+                "entry_type": entry_type,
+                "source": "teacher_grant",
+            },
+            headers=headers,
+        )
+        return response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(post, range(posts)))
+    elapsed = time.perf_counter() - started
+
+    with SessionLocal() as db:
+        balance = Decimal(str(db.get(StudentWallet, wallet_id).balance))
+        entries = db.query(LedgerEntry).filter(LedgerEntry.wallet_id == wallet_id).all()
+    ledger_total = sum(
+        (-Decimal(str(e.amount)) if e.entry_type == "withdrawal" else Decimal(str(e.amount)))
+        for e in entries
+    )
+    created = statuses.count(201)
+    print(f"posts {posts}  created {created}  failed {posts - created}  {posts / elapsed:8.1f} posts/s")
+    print(f"wallet balance {balance}  ledger total {ledger_total}")
+    consistent = balance == ledger_total and len(entries) == created
+    print("OK" if consistent else "DRIFT: wallet balance does not match the ledger")
+    return consistent
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fire parallel ledger posts at one wallet and check the balance matches the ledger."
+    )
+    parser.add_argument("--posts", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--database-url", default=None, help="Defaults to a throwaway SQLite file.")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.posts, args.workers, args.database_url) else 1)
@@ -0,0 +1,20 @@
+import argparse
+
+from app.allocation import reallocate_buckets
+from app.db.session import SessionLocal
+
+
+def run(classroom_id: int | None) -> None:
+    with SessionLocal() as db:
+        updated = reallocate_buckets(db, classroom_id=classroom_id)
+        db.commit()
+    print(f"reallocated {updated} wallet buckets")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-split wallet balances over their buckets by percent target."
+    )
+    parser.add_argument("--classroom-id", type=int, default=None, help="Default: every classroom.")
+    args = parser.parse_args()
+    run(args.classroom_id)
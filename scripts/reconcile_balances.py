@@ -0,0 +1,136 @@
+import argparse
+import csv
+import sys
+import time
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import Numeric, bindparam, text
+
+from app.db.session import engine
+
+FETCH_SIZE = 100_000
+
+# Amounts are fetched as integer cents so the grouped sums are exact.
+LEDGER_QUERY = """
+    SELECT wallet_id,
+           CAST(ROUND(amount * 100) AS BIGINT)
+             * CASE WHEN entry_type = 'withdrawal' THEN -1 ELSE 1 END
+    FROM {table}
+"""
+WALLET_QUERY = "SELECT id, CAST(ROUND(balance * 100) AS BIGINT) FROM student_wallets"
+
+
+def fetch_columns(conn, query: str) -> tuple[np.ndarray, np.ndarray]:
+    """Read a two-integer-column result into NumPy arrays, FETCH_SIZE rows at a time."""
+    cursor = conn.exec_driver_sql(query).cursor
+    keys, values = [], []
+    while rows := cursor.fetchmany(FETCH_SIZE):
+        chunk = np.array(rows, dtype=np.int64)
+        keys.append(chunk[:, 0])
+        values.append(chunk[:, 1])
+    cursor.close()
+    if not keys:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(keys), np.concatenate(values)
+
+
+def ledger_sums(conn) -> tuple[np.ndarray, np.ndarray, int]:
+    wallet_ids, cents = [], []
+    for table in ("ledger_entries", "ledger_entries_archive"):
+        ids, amounts = fetch_columns(conn, LEDGER_QUERY.format(table=table))
+        wallet_ids.append(ids)
+        cents.append(amounts)
+    wallet_ids = np.concatenate(wallet_ids)
+    cents = np.concatenate(cents)
+    unique_ids, inverse = np.unique(wallet_ids, return_inverse=True)
+    # float64 weights hold integer cents exactly up to 2**53.
+    sums = np.rint(np.bincount(inverse, weights=cents, minlength=len(unique_ids)))
+    return unique_ids, sums.astype(np.int64), len(wallet_ids)
+
+
+def read_snapshot(conn):
+    """Read ledger sums and stored balances from one snapshot of the database.
+
+    Without it a posting or archive run committed between the reads would show
+    up as a mismatch, and ``--fix`` would apply it.
+    """
+    if conn.dialect.name == "sqlite":
+        # pysqlite does not BEGIN before a SELECT, so every read would be its own
+        # snapshot; take the driver out of the way and open the transaction here.
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("BEGIN")
+        try:
+            return ledger_sums(conn), fetch_columns(conn, WALLET_QUERY)
+        finally:
+            conn.exec_driver_sql("COMMIT")
+    if conn.dialect.name == "postgresql":
+        conn = conn.execution_options(isolation_level="REPEATABLE READ")
+    with conn.begin():
+        return ledger_sums(conn), fetch_columns(conn, WALLET_QUERY)
+
+
+def reconcile(report_path: str, fix: bool) -> int:
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        (ledger_ids, ledger_cents, entries), (wallet_ids, balance_cents) = read_snapshot(conn)
+
+    expected = np.zeros(len(wallet_ids), dtype=np.int64)
+    positions = np.searchsorted(ledger_ids, wallet_ids)
+    found = positions < len(ledger_ids)
+    found[found] = ledger_ids[positions[found]] == wallet_ids[found]
+    expected[found] = ledger_cents[positions[found]]
+    difference = expected - balance_cents
+    mismatched = np.flatnonzero(difference)
+    orphaned = np.setdiff1d(ledger_ids, wallet_ids)
+
+    with open(report_path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["wallet_id", "stored_balance", "ledger_balance", "difference"])
+        for i in mismatched:
+            writer.writerow(
+                [
+                    int(wallet_ids[i]),
+                    f"{balance_cents[i] / 100:.2f}",
+                    f"{expected[i] / 100:.2f}",
+                    f"{difference[i] / 100:.2f}",
+                ]
+            )
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"checked {len(wallet_ids)} wallets against {entries} ledger entries in {elapsed:.2f}s: "
+        f"{len(mismatched)} mismatched, {len(orphaned)} wallet ids with entries but no wallet"
+    )
+    print(f"report written to {report_path}")
+
+    if fix and len(mismatched):
+        # Shift by the difference rather than overwrite, so postings committed
+        # since the snapshot stay counted.
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE student_wallets SET balance = balance + :delta WHERE id = :wallet_id"
+                ).bindparams(bindparam("delta", type_=Numeric(12, 2))),
+                [
+                    {
+                        "wallet_id": int(wallet_ids[i]),
+                        "delta": Decimal(int(difference[i])).scaleb(-2),
+                    }
+                    for i in mismatched
+                ],
+            )
+        print(f"fixed {len(mismatched)} wallet balances")
+    return len(mismatched)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check StudentWallet.balance against the ledger."
+    )
+    parser.add_argument("--report", default="balance-reconciliation.csv")
+    parser.add_argument(
+        "--fix", action="store_true", help="Shift mismatched balances to match the ledger."
+    )
+    args = parser.parse_args()
+    sys.exit(1 if reconcile(args.report, args.fix) and not args.fix else 0)
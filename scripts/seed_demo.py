@@ -3,6 +3,7 @@ import os
 from datetime import date
 from decimal import Decimal
 
+from app.balances import apply_balance_delta, signed_amount
 from app.core.security import get_password_hash
 from app.db.base import Base
 from app.db.session import SessionLocal, engine
@@ -148,26 +149,22 @@ def seed(reset: bool = False) -> None:
                     defaults={"percent_target": percent},
                 )
 
-            get_or_create(
-                db,
-                LedgerEntry,
-                wallet_id=wallet.id,
-                assignment_id=assignments[0].id,
-                amount=Decimal("50.00"),
-                entry_type="deposit",
-                source="teacher_grant",
-                defaults={"memo": "Classroom grant"},
-            )
-            get_or_create(
-                db,
-                LedgerEntry,
-                wallet_id=wallet.id,
-                assignment_id=assignments[0].id,
-                amount=Decimal("12.00"),
-                entry_type="withdrawal",
-                source="student_action",
-                defaults={"memo": "Snack purchase"},
-            )
+            for amount, entry_type, source, memo in [
+                (Decimal("50.00"), "deposit", "teacher_grant", "Classroom grant"),
+                (Decimal("12.00"), "withdrawal", "student_action", "Snack purchase"),
+            ]:
+                _, created = get_or_create(
+                    db,
+                    LedgerEntry,
+                    wallet_id=wallet.id,
+                    assignment_id=assignments[0].id,
+                    amount=amount,
+                    entry_type=entry_type,
+                    source=source,
+                    defaults={"memo": memo},
+                )
+                if created:
+                    apply_balance_delta(db, wallet.id, signed_amount(entry_type, amount))
 
             submission, _ = get_or_create(
                 db,
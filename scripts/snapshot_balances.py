@@ -0,0 +1,25 @@
+import argparse
+from datetime import datetime
+
+from app.balances import take_balance_snapshots
+from app.db.session import SessionLocal
+
+
+def run(as_of: datetime | None) -> None:
+    with SessionLocal() as db:
+        written = take_balance_snapshots(db, as_of)
+    print(f"wrote {written} wallet balance snapshots")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Snapshot wallet balances for wallets with ledger activity since their last snapshot."
+    )
+    parser.add_argument(
+        "--as-of",
+        type=datetime.fromisoformat,
+        default=None,
+        help="UTC timestamp to snapshot at (default: now minus BALANCE_SNAPSHOT_SETTLE_SECONDS).",
+    )
+    args = parser.parse_args()
+    run(args.as_of)